@@ -1,13 +1,18 @@
 import streamlit as st
-from io import BytesIO
-from pdf2image import convert_from_bytes
-import fitz 
-import json, os, hashlib, base64
-from extract import ExtractTextInfoFromPDF
-from PIL import ImageDraw, ImageFont
-from streamlit.components.v1 import html
+import os, hashlib, time, threading, logging
+from jobs import ExtractionJobs, EXTRACT_ROOT
 from dotenv import load_dotenv
 from openai import OpenAI
+from llm import stream_complete, map_reduce_summary, summarize_batch
+from chunker import chunk_elements
+from documents import DocumentRegistry
+from retrieval import RetrievalIndex, get_embedder
+from sections import SectionSummaries, find_section
+from jargon import JargonService
+from tables import serialize_table
+from overlay import page_overlay
+from paper_index import PaperIndex
+from docstore import SOURCE_NAME, write_atomic
 
 
 st.set_page_config(
@@ -48,14 +53,14 @@ def get_prompt_prefix():
     return prefix
 
 
-def summarize_text(text: str) -> str:
-    """Ask ChatGPT to produce a concise summary using global context."""
+def summarize_text(text: str):
+    """Ask ChatGPT to produce a concise summary using global context, streamed as text deltas."""
     summary_context = st.session_state.get("global_summary", "")
     full_prompt = f"""You are a succinct summarizer. Here is the overall context of the document:{summary_context} Now, please summarize this specific section:{text}"""
     prefix = get_prompt_prefix()
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[
+    return stream_complete(
+        client,
+        [
         { "role": "system",
             "content": f"{prefix} You are a helpful assistant for academic summarization."
         },
@@ -65,139 +70,203 @@ def summarize_text(text: str) -> str:
         temperature=0.3,
         max_tokens=200
     )
-    return response.choices[0].message.content.strip()
       
 
-def summarize_entire_pdf(elts) -> str:
-    """Summarizes the entire PDF in chunks and then summarizes those summaries."""
-    all_text = "\n".join(el.get("Text", "") for el in elts if "Text" in el).strip()
-    if not all_text:
-        return "No extractable text found in the PDF."
-
-    chunks = chunk_text(all_text, max_chars=8000)
-    print(f"Chunk count: {len(chunks)}")
-    print(f"Chunk 0 length: {len(chunks[0])} characters")
-
-    intermediate_summaries = []
-
-    for i, chunk in enumerate(chunks):
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "user", "content": f"Summarize this part of a research paper:\n\n{chunk}"}
-            ],
-            temperature=0.3,
-            max_tokens=500
-        )
-        summary = response.choices[0].message.content.strip()
-        intermediate_summaries.append(summary)
-
-    combined_summary_text = "\n".join(intermediate_summaries)
-
-    final_response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant that combines summaries into one final summary."},
-            {"role": "user", "content": f"Combine and summarize the following summaries:\n\n{combined_summary_text}"}
+def explain_table(rows):
+    """Asks ChatGPT to explain a table, sent as compact pipe-separated rows, streamed as text deltas."""
+    summary_context = st.session_state.get("global_summary", "")
+    prefix = get_prompt_prefix()
+    return stream_complete(
+        client,
+        [
+            {"role": "system", "content": f"{prefix} You are a helpful assistant for reading academic tables."},
+            {"role": "user",
+             "content": f"Here is the overall context: {summary_context}\n"
+                        f"Explain what this table shows and its key findings:\n{serialize_table(rows)}"}
         ],
         temperature=0.3,
-        max_tokens=500
+        max_tokens=300
     )
 
-    return final_response.choices[0].message.content.strip()
+def summarize_elements(indices):
+    """Summarizes several elements with one copy of the global context per request."""
+    prefix = get_prompt_prefix()
+    items = [(i, elts[i].get("Text", "").strip()) for i in indices]
+    return summarize_batch(
+        client,
+        [(i, t) for i, t in items if t],
+        f"{prefix} You are a helpful assistant for academic summarization.",
+        context=st.session_state.get("global_summary", "")
+    )
 
-def chunk_text(text, max_chars):
-    """Splits text into chunks of a specified maximum character length."""
-    words = text.split()
-    chunks = []
-    current_chunk = []
 
-    for word in words:
-        if len(" ".join(current_chunk + [word])) > max_chars:
-            chunks.append(" ".join(current_chunk))
-            current_chunk = [word]
-        else:
-            current_chunk.append(word)
+def summarize_entire_pdf(elts):
+    """Summarizes the PDF chunks concurrently and streams the combined summary."""
+    chunks = chunk_elements(elts, max_tokens=2000, min_tokens=1000)
+    if not chunks:
+        return iter(["No extractable text found in the PDF."])
 
-    if current_chunk:
-        chunks.append(" ".join(current_chunk))
+    logging.info(f"Summarizing {len(chunks)} chunks, {sum(c['tokens'] for c in chunks)} tokens")
 
-    return chunks
+    return map_reduce_summary(client, [c["text"] for c in chunks], stream=True)
 
 
-def render_images(pdf):
-    b = BytesIO(pdf.read())
-    pages = convert_from_bytes(b.getvalue(), size=(612,792))
-    pdf.seek(0)
-    return pages
+def show_global_summary(document):
+    """Renders the whole-paper summary, streaming it the first time and storing it beside the extraction output."""
+    summary = document.summary
+    path = os.path.join(document.outdir, "summary.txt")
+    if summary is None and os.path.exists(path):
+        with open(path) as f:
+            summary = f.read()
+    if summary is None:
+        with st.spinner("Summarizing the entire PDF..."):
+            stream = summarize_entire_pdf(document.elements)
+        summary = st.write_stream(stream)
+        write_atomic(path, summary.encode("utf-8"))
+    else:
+        st.markdown(summary)
+    document.summary = summary
+    st.session_state["global_summary"] = summary
 
-def page_sizes(pdf):
-    pdf.seek(0)
-    doc = fitz.open(stream=pdf.read(), filetype="pdf")
-    return [(p.rect.width, p.rect.height) for p in doc]
 
-def md5sum(pdf):
+@st.cache_resource
+def document_registry():
+    return DocumentRegistry()
+
+def ingest_pdf(pdf):
+    """Reads the upload once and hashes that same buffer."""
     pdf.seek(0)
-    return hashlib.md5(pdf.read()).hexdigest()
-
-def parse_pdf(pdf):
-    h      = md5sum(pdf)
-    outdir = f"output/ExtractTextInfoFromPDF/{h}"
-    datafn = os.path.join(outdir, "structuredData.json")
-    if not os.path.exists(datafn):
-        os.makedirs(outdir, exist_ok=True)
-        pdf.seek(0)
-        with open("extractPdfInput.pdf","wb") as f:
-            f.write(pdf.read())
-        st.session_state["extracted_images"] = extract_images_from_pdf("uploaded.pdf")
-        ExtractTextInfoFromPDF(output_path=datafn)
-    return json.load(open(datafn)), outdir
+    data = pdf.read()
+    return data, hashlib.md5(data).hexdigest()
+
+@st.cache_resource
+def paper_index():
+    """The cross-paper search index; papers extracted before it existed are added in the background."""
+    index = PaperIndex()
+    threading.Thread(target=index.sync, args=(EXTRACT_ROOT,), daemon=True).start()
+    return index
+
+@st.cache_resource
+def extraction_jobs():
+    return ExtractionJobs(listeners=[paper_index().add])
+
+def open_pdf(pdf):
+    """Ingests an upload: one read, one hash, one shared fitz document (which
+    also catalogs embedded images), and background extraction fed from the same buffer."""
+    data, h = ingest_pdf(pdf)
+    jobs    = extraction_jobs()
+    outdir  = jobs.outdir(h)
+    os.makedirs(outdir, exist_ok=True)
+    source  = os.path.join(outdir, SOURCE_NAME)
+    if not os.path.exists(source):
+        # Kept so search hits can reopen the paper without an upload.
+        write_atomic(source, data)
+    handle  = document_registry().acquire(h, outdir, data)
+    if jobs.status(h)["state"] != "done":
+        jobs.submit(h, data)
+    return h, outdir, handle
+
+def open_hit(hit):
+    """Opens an indexed paper from its stored PDF, on the page and element of a search hit."""
+    outdir = extraction_jobs().outdir(hit["doc_hash"])
+    with open(os.path.join(outdir, SOURCE_NAME), "rb") as f:
+        data = f.read()
+    st.session_state.doc = document_registry().acquire(hit["doc_hash"], outdir, data)
+    st.session_state.doc_hash = hit["doc_hash"]
+    st.session_state.outdir = outdir
+    st.session_state.pdf_uploaded = True
+    for key in ("elements_version", "sections", "jargon"):
+        st.session_state.pop(key, None)
+    reset_element_state()
+    go_to(hit["page"] or 0, hit["idx"])
+
+def reset_element_state():
+    """Drops everything keyed by element index: selection, summaries, notes,
+    chat answers and the matching widget state."""
+    st.session_state.active_idx = None
+    st.session_state.summaries = {}
+    st.session_state.per_el_state = {}
+    for key in list(st.session_state):
+        if key.startswith(("notes_", "chat_q_", "multi_", "el_window:")):
+            del st.session_state[key]
+
+@st.cache_resource
+def retrieval_index(outdir, version, _elements):
+    return RetrievalIndex.load(outdir, _elements, get_embedder(client), version)
+
+@st.cache_resource
+def section_summaries():
+    return SectionSummaries(client)
+
+@st.cache_resource
+def jargon_service():
+    return JargonService(client)
+
+def load_parsed(document):
+    """Attaches the latest extraction results to the document; returns False while pending."""
+    if not extraction_jobs().extracted(document.doc_hash):
+        return False
+    elements = document.attach_elements()
+    if st.session_state.get("elements_version") != document.version:
+        if st.session_state.get("elements_version") is not None:
+            # A refined extraction renumbers the elements.
+            reset_element_state()
+        st.session_state.elements_version = document.version
+        st.session_state.pop("sections", None)
+        st.session_state.pop("jargon", None)
+        section_summaries().submit(document.outdir, elements, document.version)
+        jargon_service().submit(document.outdir, elements, document.version)
+    return True
 
  
 
 
-def extract_images_from_pdf(pdf_path):
-    doc = fitz.open(pdf_path)
-    image_info_list = []
-
-    for page_index in range(len(doc)):
-        page = doc[page_index]
-        images = page.get_images(full=True)
-
-        for img_index, img in enumerate(images):
-            xref = images[img_index][0]
-            base_image = doc.extract_image(xref)
-            image_bytes = base_image["image"]
-            ext = base_image["ext"]
-
-            image_info_list.append({
-                "page": page_index,
-                "image_bytes": image_bytes,
-                "extension": ext,
-                "xref": xref
-            })
-
-    return image_info_list
-
+def go_to(page, idx=None):
+    """Shows a page (and selects an element) from code, keeping the keyed page selector in step."""
+    st.session_state.current_page = page
+    st.session_state.page_sel = page
+    st.session_state.active_idx = idx
 
 def nav(delta):
-    st.session_state.current_page = max(
+    go_to(max(
         0,
-        min(st.session_state.current_page + delta, len(st.session_state.images) - 1)
-    )
-    st.session_state.active_idx = None
+        min(st.session_state.current_page + delta, len(st.session_state.doc.document.pages) - 1)
+    ))
     st.rerun()
 
 for k,v in {
     "pdf_uploaded": False,
-    "images": [],
-    "sizes": [],
-    "parsed": {},
+    "doc": None,
     "outdir": "",
     "current_page": 0,
-    "active_idx": None
+    "active_idx": None,
+    "doc_hash": ""
 }.items():
     st.session_state.setdefault(k, v)
+# The page selector's state; go_to() keeps it in step with current_page.
+st.session_state.setdefault("page_sel", st.session_state.current_page)
+
+
+@st.fragment
+def library_search():
+    st.header("Search all papers")
+    query = st.text_input("Find text in any processed paper:", key="library_q")
+    if not query.strip():
+        return
+    hits = paper_index().search(query)
+    if not hits:
+        st.caption("No matches.")
+    for n, hit in enumerate(hits):
+        title = hit["title"] or hit["doc_hash"][:8]
+        st.markdown(f"**{title}** · page {(hit['page'] or 0) + 1}  \n{hit['snippet']}")
+        available = os.path.exists(os.path.join(extraction_jobs().outdir(hit["doc_hash"]), SOURCE_NAME))
+        if st.button("Open", key=f"library_open_{n}", disabled=not available,
+                     help=None if available else "Upload this paper again to view it."):
+            open_hit(hit)
+            st.rerun()
+
+with st.sidebar:
+    library_search()
 
 
 if not st.session_state.pdf_uploaded:
@@ -205,123 +274,128 @@ if not st.session_state.pdf_uploaded:
     up = st.file_uploader("Select a PDF", type="pdf")
     if up:
         st.session_state.pdf_uploaded = True
-        st.session_state.images     = render_images(up)
-        st.session_state.sizes      = page_sizes(up)
-        st.session_state.parsed, st.session_state.outdir = parse_pdf(up)
-
-        with st.spinner("Summarizing the entire PDF..."):
-            st.session_state["global_summary"] = summarize_entire_pdf(st.session_state.parsed.get("elements", []))
-        
+        st.session_state.doc_hash, st.session_state.outdir, st.session_state.doc = open_pdf(up)
         st.rerun()
     else:
         st.stop()
 
 
-imgs = st.session_state.images
-w_pts, h_pts = st.session_state.sizes[st.session_state.current_page]
-elts = st.session_state.parsed.get("elements", [])
-
-
-
-st.session_state.setdefault("per_el_state", {})  
-def bucket(idx):
-    return st.session_state.per_el_state.setdefault(idx, {"chat": "", "notes": ""})
-
-page = st.session_state.current_page
-active = st.session_state.active_idx
+@st.fragment(run_every=2)
+def extraction_status():
+    status = extraction_jobs().status(st.session_state.doc_hash)
+    if status["state"] == "done":
+        st.rerun(scope="app")
+    elif status["state"] in ("failed", "missing"):
+        st.error(f"Extraction failed: {status.get('error', 'the job is no longer running')}")
+        if st.button("Upload again"):
+            st.session_state.pdf_uploaded = False
+            st.session_state.doc = None
+            st.rerun(scope="app")
+    elif status["state"] == "refining":
+        elapsed = time.time() - status.get("started", time.time())
+        st.info(f"Refining document structure with cloud extraction ({elapsed:.0f}s)… components will update when it finishes.")
+    else:
+        elapsed = time.time() - status.get("started", status.get("submitted", time.time()))
+        st.info(f"Extracting document structure ({status['state']}, {elapsed:.0f}s)… pages are viewable meanwhile.")
 
+document = st.session_state.doc.document
+with st.sidebar:
+    if st.button("Pre-render all pages"):
+        bar = st.progress(0.0, text="Rendering pages…")
+        document.pages.prerender(
+            progress=lambda done, total: bar.progress(done / total if total else 1.0, text=f"Rendered {done}/{total} pages")
+        )
 
+if load_parsed(document):
+    with st.expander("Paper summary", expanded=document.summary is None):
+        show_global_summary(document)
+if extraction_jobs().status(document.doc_hash)["state"] != "done":
+    extraction_status()
 
-disp_w = 612
-scale_x = disp_w / w_pts
-scale_y = imgs[page].height / h_pts
 
+imgs = document.pages
+elts = document.elements or []
 
-def draw_boxes_on_image(image, elements, page_index, active_idx=None):
-    draw = ImageDraw.Draw(image)
 
-    if active_idx is not None:
-        el = elements[active_idx]
-        if el.get("Page") == page_index and "Bounds" in el:
-            l, b, r, t = el["Bounds"]
-            x0 = l * scale_x
-            y0 = (h_pts - t) * scale_y
-            x1 = r * scale_x
-            y1 = (h_pts - b) * scale_y
-            draw.rectangle([x0, y0, x1, y1], outline="gold", width=2)
 
-    return image
+st.session_state.setdefault("per_el_state", {})  
+def bucket(idx):
+    return st.session_state.per_el_state.setdefault(idx, {"chat": "", "notes": ""})
 
 
 
+disp_w = 612
+ELEMENT_LIST_WINDOW = 30
+DISPLAY_IMAGE_TYPES = ("png", "jpeg", "jpg", "gif", "bmp", "webp")
+page_index = document.page_index
 
-buf = BytesIO()
-imgs[page].save(buf, format="PNG")
-img64 = base64.b64encode(buf.getvalue()).decode()
 
-col1, col2 = st.columns([2,1])
+# The viewer is split into fragments so an interaction only re-executes the
+# region it affects: panel widgets rerun the panel, a click on the page reruns
+# the canvas and panel, and only page turns or sidebar picks rerun the app.
 
-with st.sidebar:
+@st.fragment
+def element_list():
+    page = st.session_state.current_page
     st.header("Components")
-    for i, el in enumerate(elts):
-        if el.get("Page") != page or "Bounds" not in el:
-            continue
+    query = st.text_input("Search the paper:", key="el_search")
+    if query.strip() and document.text_index is not None:
+        ids = document.text_index.search(query)
+        st.caption(f"{len(ids)} matching components")
+    else:
+        ids = page_index.elements_on(page)
+
+    # Only a window of rows is rendered; "Show more" grows it and reruns just this list.
+    window_key = f"el_window:{query}:{page}"
+    shown = st.session_state.get(window_key, ELEMENT_LIST_WINDOW)
+    for i in ids[:shown]:
+        el = elts[i]
         txt_preview = el.get("Text", "")[:100].strip() or "[no text]"
-        if st.button(f"{i}: {txt_preview}", key=f"el_btn_{i}"):
-            st.session_state.active_idx = i
+        label = f"{i}: {txt_preview}" if el.get("Page") == page else f"p{el.get('Page', 0) + 1} · {i}: {txt_preview}"
+        if st.button(label, key=f"el_btn_{i}"):
+            go_to(el["Page"] if el.get("Page") is not None else page, i)
+            # The canvas and panel live outside this fragment.
             st.rerun()
-
-
-
-with col1:
-
-    buf = BytesIO()
-    imgs[page].save(buf, format="PNG")
-    img64 = base64.b64encode(buf.getvalue()).decode()
-
-    highlight_boxes = []
-    for i, el in enumerate(elts):
-        if el.get("Page") != page or "Bounds" not in el:
-            continue
-        l, b, r, t = el["Bounds"]
-        x = l * scale_x
-        y = (h_pts - t) * scale_y
-        w = (r - l) * scale_x
-        h = (t - b) * scale_y
-
-        border = "2px solid #FFD700" if i == active else "1px solid rgba(0,0,0,0.1)"
-        background = "rgba(255,215,0,0.15)" if i == active else "transparent"
-
-        highlight_boxes.append(f"""
-        <div onclick="select({i})"
-            style="position:absolute; left:{x}px; top:{y}px;
-                    width:{w}px; height:{h}px;
-                    border:{border}; background:{background};
-                    cursor:pointer;">
-        </div>
-        """)
-
-    html_code = f"""
-    <div style="position:relative; width:{disp_w}px; height:{imgs[page].height}px;">
-    <img src="data:image/png;base64,{img64}"
-        style="width:{disp_w}px; height:{imgs[page].height}px; display:block;" />
-    {''.join(highlight_boxes)}
-    </div>
-    <script>
-    function select(idx) {{
-        window.parent.postMessage({{
-        isStreamlitMessage: true,
-        type: "streamlit:setComponentValue",
-        value: idx
-        }}, "*");
-    }}
-    </script>
-    """
-
-    clicked = html(html_code, height=imgs[page].height + 30)
-    if isinstance(clicked, (int, float)):
-        st.session_state.active_idx = int(clicked)
-        st.rerun()
+    if len(ids) > shown and st.button(f"Show more ({len(ids) - shown} left)", key="el_more"):
+        st.session_state[window_key] = shown + ELEMENT_LIST_WINDOW
+        st.rerun(scope="fragment")
+
+
+@st.fragment
+def page_figures():
+    page = st.session_state.current_page
+    # The catalog scans the PDF on first use, so only once figures are asked for.
+    if not st.toggle("Show figures on this page", key="show_figures"):
+        return
+    figures = document.images.on_page(page)
+    if not figures:
+        st.caption("No embedded images on this page.")
+    for entry in figures:
+        data, ext = document.images.load(entry["xref"])
+        if ext in DISPLAY_IMAGE_TYPES:
+            st.image(data, caption=f"{entry['width']}×{entry['height']} px")
+        else:
+            st.caption(f"{entry['width']}×{entry['height']} px {ext} image (not displayable)")
+
+
+def page_canvas():
+    page = st.session_state.current_page
+    active = st.session_state.active_idx
+    w_pts, h_pts = document.sizes[page]
+    page_h = imgs.size(page)[1]
+    page_layout = page_index.layout(page, disp_w / w_pts, page_h / h_pts)
+
+    clicked = page_overlay(
+        f"{document.doc_hash}:{document.version}:{page}",
+        lambda: imgs.data_uri(page),
+        page_layout,
+        disp_w,
+        page_h,
+        active=active
+    )
+    if clicked is not None and clicked != active:
+        st.session_state.active_idx = clicked
+        st.rerun(scope="fragment")
 
     c1, c2 = st.columns([1,1])
     with c1:
@@ -334,7 +408,6 @@ with col1:
     sel = st.selectbox(
         "Go to page:",
         list(range(len(imgs))),
-        index=page,
         format_func=lambda i: f"Page {i+1}",
         key="page_sel"
     )
@@ -343,7 +416,10 @@ with col1:
         st.session_state.active_idx = None
         st.rerun()
 
-with col2:
+
+@st.fragment
+def element_panel():
+    page = st.session_state.current_page
     tab1, tab2, tab3 = st.tabs(["Summary", "Chat", "Notes"])
 
     el = None
@@ -362,54 +438,106 @@ with col2:
             if txt:
                 st.code(txt, language="markdown")
 
-                if st.button("Summarize this", key=f"summarize_{idx}"):
-                    with st.spinner("Summarizing…"):
-                        summary = summarize_text(txt)
-                        st.session_state["summaries"][idx] = summary
-                    st.rerun()
+                if st.session_state.get("sections") is None:
+                    st.session_state["sections"] = section_summaries().load(document.outdir, document.version)
+                section = find_section(st.session_state["sections"] or [], idx)
+                if section and section.get("summary"):
+                    title = section["title"] or "untitled section"
+                    if section.get("part"):
+                        title += f", part {section['part']}"
+                    st.markdown(f"**Section summary** ({title}):")
+                    st.markdown(section["summary"])
+                elif section_summaries().pending(st.session_state.outdir):
+                    st.caption("Section summaries are being prepared…")
+
+                jargon = st.session_state.get("jargon")
+                if jargon is None or jargon_service().pending(st.session_state.outdir):
+                    jargon = st.session_state["jargon"] = jargon_service().load(document.outdir, document.version)
+                terms = jargon.terms_in(idx) if jargon else []
+                if terms:
+                    st.markdown("**Jargon:**")
+                    for term in terms:
+                        with st.expander(term):
+                            expansion = jargon.terms[term].get("expansion")
+                            if expansion:
+                                st.caption(expansion)
+                            st.markdown(jargon.definition(term) or "_Definition is being prepared…_")
 
-                summary = st.session_state["summaries"].get(idx)
-                if summary:
+                if st.button("Summarize this", key=f"summarize_{idx}"):
                     st.markdown("**Summary:**")
-                    st.markdown(summary)
+                    st.session_state["summaries"][idx] = st.write_stream(summarize_text(txt))
+                else:
+                    summary = st.session_state["summaries"].get(idx)
+                    if summary:
+                        st.markdown("**Summary:**")
+                        st.markdown(summary)
 
             else:
                 st.info("No text to summarize for this component.")
 
-    # Chat
-with tab2:
-    st.subheader("Chat")
-    if not el:
-        st.info("Select an element first.")
-    else:
-        b = bucket(idx)
-        text_context = el.get("Text", "").strip()
-        q = st.text_input("Ask about this component:", key=f"chat_q_{idx}")
-        if q:
-            if st.button("Send", key=f"chat_send_{idx}"):
-                with st.spinner("Thinking..."):
-                    global_summary = st.session_state.get("global_summary", "")
-                    prefix = get_prompt_prefix()
-                    response = client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                        { "role":"system",
-                            "content": f"{prefix} You are a helpful assistant answering questions about research papers."
-                        },
-                        { "role":"user",
-                            "content": f"{prefix}\nFull paper summary: {global_summary}\nSection text: {text_context}\nUser question: {q}" }
-                        ],
-                        temperature=0.4,
-                        max_tokens=400
-                    )
-                    b["chat"] = q
-                    b["chat_response"] = response.choices[0].message.content.strip()
-                st.rerun()
-        if b.get("chat_response"):
-            st.markdown("**Response:**")
-            st.markdown(b["chat_response"])
-
+            table_idx = document.tables.table_for(idx, el.get("Path")) if document.tables else None
+            if table_idx is not None:
+                rows = document.tables.load(table_idx)
+                if rows:
+                    st.markdown("**Table:**")
+                    st.dataframe(rows, use_container_width=True)
+                    key = f"table_{table_idx}"
+                    if st.button("Explain this table", key=f"explain_{table_idx}"):
+                        st.markdown("**Explanation:**")
+                        st.session_state["summaries"][key] = st.write_stream(explain_table(rows))
+                    elif st.session_state["summaries"].get(key):
+                        st.markdown("**Explanation:**")
+                        st.markdown(st.session_state["summaries"][key])
+
+        text_ids = [i for i in page_index.elements_on(page) if elts[i].get("Text", "").strip()]
+        chosen = st.multiselect(
+            "Summarize several components:",
+            text_ids,
+            format_func=lambda i: f"{i}: {elts[i].get('Text', '')[:40].strip()}",
+            key=f"multi_{page}"
+        )
+        if chosen and st.button("Summarize selected", key=f"summarize_multi_{page}"):
+            with st.spinner("Summarizing…"):
+                st.session_state["summaries"].update(summarize_elements(chosen))
+        for i in chosen:
+            if st.session_state["summaries"].get(i):
+                st.markdown(f"**{i}:** {st.session_state['summaries'][i]}")
 
+    # Chat
+    with tab2:
+        st.subheader("Chat")
+        if not el:
+            st.info("Select an element first.")
+        else:
+            b = bucket(idx)
+            text_context = el.get("Text", "").strip()
+            q = st.text_input("Ask about this component:", key=f"chat_q_{idx}")
+            if q and st.button("Send", key=f"chat_send_{idx}"):
+                global_summary = st.session_state.get("global_summary", "")
+                prefix = get_prompt_prefix()
+                with st.spinner("Searching the paper..."):
+                    hits = retrieval_index(document.outdir, document.version, elts).search(f"{q}\n{text_context}")
+                excerpts = "\n\n".join(f"[page {h['page'] + 1}] {h['text']}" for h in hits)
+                b["chat"] = q
+                b["chat_sources"] = sorted({h["page"] + 1 for h in hits})
+                st.markdown("**Response:**")
+                b["chat_response"] = st.write_stream(stream_complete(
+                    client,
+                    [
+                    { "role":"system",
+                        "content": f"{prefix} You are a helpful assistant answering questions about research papers."
+                    },
+                    { "role":"user",
+                        "content": f"{prefix}\nFull paper summary: {global_summary}\nRelevant excerpts from the paper:\n{excerpts}\nSection text: {text_context}\nUser question: {q}" }
+                    ],
+                    temperature=0.4,
+                    max_tokens=400
+                ))
+            elif b.get("chat_response"):
+                st.markdown("**Response:**")
+                st.markdown(b["chat_response"])
+            if b.get("chat_response") and b.get("chat_sources"):
+                st.caption("Sources: " + ", ".join(f"page {p}" for p in b["chat_sources"]))
 
     # Notes
     with tab3:
@@ -428,3 +556,19 @@ with tab2:
                 file_name=f"notes_component_{idx}.txt",
                 mime="text/plain"
             )
+
+
+@st.fragment
+def viewer():
+    col1, col2 = st.columns([2,1])
+    with col1:
+        page_canvas()
+    with col2:
+        element_panel()
+
+
+with st.sidebar:
+    element_list()
+    page_figures()
+
+viewer()
@@ -0,0 +1,131 @@
+import re
+import logging
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _encoding = None
+except Exception:
+    # The encoding file is downloaded on first use; stay usable offline.
+    logging.warning("tiktoken encoding unavailable, estimating token counts", exc_info=True)
+    _encoding = None
+
+HEADING_TAGS = ("Title", "H1", "H2", "H3")
+_WORD_PIECES = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text):
+    """Counts model tokens, falling back to a word/punctuation estimate without tiktoken."""
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return sum(max(1, (len(p) + 3) // 4) for p in _WORD_PIECES.findall(text))
+
+
+def path_tag(path):
+    """Returns the structural tag of an element path, e.g. '//Document/H2' -> 'H2'."""
+    parts = path.strip("/").split("/")
+    return re.sub(r"\[\d+\]$", "", parts[1]) if len(parts) > 1 else ""
+
+
+def path_block(path):
+    """Returns the top-level block of an element path, e.g. 'Table[2]' for a table cell."""
+    parts = path.strip("/").split("/")
+    return parts[1] if len(parts) > 1 else ""
+
+
+def chunk_text(text, max_tokens, overlap_tokens=0):
+    """Splits plain text into chunks of at most max_tokens, in a single pass over the words."""
+    chunks = []
+    current, sizes, total = [], [], 0
+
+    for word in text.split():
+        n = count_tokens(word)
+        if current and total + n > max_tokens:
+            chunks.append(" ".join(current))
+            current, sizes, total = _tail(current, sizes, overlap_tokens)
+        current.append(word)
+        sizes.append(n)
+        total += n
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _tail(units, sizes, overlap_tokens):
+    """Returns the trailing units that fit in overlap_tokens, to seed the next chunk."""
+    keep, total = 0, 0
+    while keep < len(units) and total + sizes[-1 - keep] <= overlap_tokens:
+        total += sizes[-1 - keep]
+        keep += 1
+    if keep == 0:
+        return [], [], 0
+    return units[-keep:], sizes[-keep:], total
+
+
+def chunk_elements(elements, max_tokens=2000, overlap_tokens=0, min_tokens=0):
+    """Groups extracted elements into token-bounded chunks.
+
+    Chunks are cut before headings and around tables (using the element
+    `Path`) once the current chunk holds at least min_tokens, and otherwise
+    when the next element would exceed max_tokens.
+    Each chunk is a dict with its text, token count, the [start, end]
+    element indices it covers and the page it starts on.
+    """
+    chunks = []
+    texts, sizes, idxs = [], [], []
+    total = 0
+    prev_block = None
+
+    def flush(overlap):
+        nonlocal texts, sizes, idxs, total
+        if texts:
+            chunks.append({
+                "text": "\n".join(texts),
+                "tokens": total,
+                "start": idxs[0],
+                "end": idxs[-1],
+                "page": elements[idxs[0]].get("Page")
+            })
+        keep = min(len(_tail(texts, sizes, overlap)[0]), len(texts) - 1) if overlap and texts else 0
+        texts, sizes, idxs = texts[len(texts) - keep:], sizes[len(sizes) - keep:], idxs[len(idxs) - keep:]
+        total = sum(sizes)
+
+    for i, el in enumerate(elements):
+        text = el.get("Text", "").strip()
+        if not text:
+            continue
+        path = el.get("Path", "")
+        block = path_block(path)
+        in_table = block.startswith("Table")
+        structural = path_tag(path) in HEADING_TAGS or (
+            prev_block is not None and block != prev_block and (in_table or prev_block.startswith("Table"))
+        )
+        prev_block = block
+
+        if structural and total >= min_tokens:
+            flush(0)
+
+        n = count_tokens(text)
+        if n > max_tokens:
+            flush(0)
+            for piece in chunk_text(text, max_tokens, overlap_tokens):
+                chunks.append({
+                    "text": piece,
+                    "tokens": count_tokens(piece),
+                    "start": i,
+                    "end": i,
+                    "page": el.get("Page")
+                })
+            continue
+
+        if texts and total + n > max_tokens:
+            flush(overlap_tokens)
+        texts.append(text)
+        sizes.append(n)
+        idxs.append(i)
+        total += n
+
+    flush(0)
+    return chunks
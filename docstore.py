@@ -0,0 +1,70 @@
+import os
+import gzip
+import shutil
+import json
+import threading
+
+DATA_NAME = "structuredData.json"
+SOURCE_NAME = "source.pdf"
+COMPRESS_JSON = os.getenv("CONFER_COMPRESS_JSON", "0") == "1"
+DERIVED = ("columns", "retrieval", "sections.json", "jargon.json", "tables.json", "text_index.json")
+
+
+def data_path(outdir):
+    """Returns the stored structuredData path (plain or gzipped), or None if absent."""
+    for name in (DATA_NAME, f"{DATA_NAME}.gz"):
+        path = os.path.join(outdir, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def data_version(outdir):
+    """Returns the mtime of the stored structuredData, which identifies its version, or None."""
+    path = data_path(outdir)
+    try:
+        return os.path.getmtime(path) if path else None
+    except OSError:
+        return None
+
+
+def load_structured_data(outdir):
+    """Loads structuredData.json from a hash directory, or returns None if absent."""
+    path = data_path(outdir)
+    if path is None:
+        return None
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_atomic(path, data):
+    """Writes bytes to path via a temp file and rename so readers never see partial files."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_structured_data(outdir, data, compress=COMPRESS_JSON):
+    """Stores structuredData.json once, in compact form, optionally gzip-compressed."""
+    os.makedirs(outdir, exist_ok=True)
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    name = DATA_NAME
+    if compress:
+        payload = gzip.compress(payload)
+        name += ".gz"
+    write_atomic(os.path.join(outdir, name), payload)
+    stale = os.path.join(outdir, DATA_NAME if compress else f"{DATA_NAME}.gz")
+    if os.path.exists(stale):
+        os.remove(stale)
+
+
+def invalidate_derived(outdir):
+    """Removes caches built from structuredData.json after it has been replaced."""
+    for name in DERIVED:
+        path = os.path.join(outdir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,139 @@
+import os
+import weakref
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from pages import PageRenderer
+from page_index import PageIndex
+from elements_store import ElementStore
+from images import ImageCatalog
+from tables import TableStore
+from text_index import TextIndex
+from docstore import data_version
+
+DOCUMENT_CACHE_BYTES = int(os.getenv("CONFER_DOCUMENT_CACHE_BYTES", 512 * 1024 * 1024))
+
+
+class Document:
+    """Per-paper state shared read-only by every session viewing the paper."""
+
+    def __init__(self, doc_hash, outdir, pdf_bytes):
+        self.doc_hash = doc_hash
+        self.outdir = outdir
+        self.pages = PageRenderer(pdf_bytes, outdir)
+        self.sizes = self.pages.page_sizes
+        self.images = ImageCatalog(self.pages.doc, self.pages.lock, outdir)
+        self.pdf_size = len(pdf_bytes)
+        self.elements = None
+        self.version = None
+        self.page_index = PageIndex([], self.sizes)
+        self.tables = None
+        self.text_index = None
+        self.summary = None
+        self.lock = threading.Lock()
+
+    def attach_elements(self):
+        """Maps the extracted elements and indexes them by page, once per version
+        of structuredData.json (progressive extraction replaces it)."""
+        version = data_version(self.outdir)
+        with self.lock:
+            if self.version != version:
+                elements = ElementStore.load(self.outdir)
+                self.page_index = PageIndex(elements, self.sizes)
+                self.tables = TableStore(self.outdir, version)
+                self.text_index = TextIndex.load(self.outdir, elements, version)
+                self.elements = elements
+                self.version = version
+        return self.elements
+
+    def nbytes(self):
+        """Rough resident size: PDF bytes, the rendered-page LRU and element columns."""
+        width, height = self.pages.size(0) if self.pages.page_count else (0, 0)
+        n = self.pdf_size + self.pages.memory_pages * width * height * 3
+        if self.elements is not None:
+            n += self.elements.nbytes()
+        return n
+
+
+class DocumentHandle:
+    """A session's reference to a shared document, released when the session drops it."""
+
+    def __init__(self, registry, document):
+        self.document = document
+        weakref.finalize(self, registry.release, document.doc_hash)
+
+
+class DocumentRegistry:
+    """Process-wide registry of open documents keyed by content hash.
+
+    Documents are reference counted by session handles; unreferenced ones
+    stay cached and are evicted least-recently-used first once the total
+    estimated size exceeds max_bytes. Released handles are counted down the
+    next time a document is acquired.
+    """
+
+    def __init__(self, max_bytes=DOCUMENT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.docs = OrderedDict()
+        self.refs = {}
+        self.released = deque()
+        self.lock = threading.Lock()
+
+    def acquire(self, doc_hash, outdir, pdf_bytes):
+        # Documents are built outside the registry lock (opening the PDF walks every
+        # page); sessions acquiring the same paper meanwhile wait on its future.
+        with self.lock:
+            self._drain()
+            future = self.docs.get(doc_hash)
+            build = future is None
+            if build:
+                future = self.docs[doc_hash] = Future()
+            self.docs.move_to_end(doc_hash)
+            self.refs[doc_hash] = self.refs.get(doc_hash, 0) + 1
+            self._evict()
+        if build:
+            try:
+                future.set_result(Document(doc_hash, outdir, pdf_bytes))
+            except BaseException as e:
+                with self.lock:
+                    self.docs.pop(doc_hash, None)
+                    self.refs.pop(doc_hash, None)
+                future.set_exception(e)
+                raise
+            with self.lock:
+                self._drain()
+                self._evict()
+        try:
+            document = future.result()
+        except BaseException:
+            with self.lock:
+                self._unref(doc_hash)
+            raise
+        return DocumentHandle(self, document)
+
+    def release(self, doc_hash):
+        # Called by handle finalizers, which the cyclic GC may run on any thread,
+        # including one already holding self.lock: only queue the release here.
+        self.released.append(doc_hash)
+
+    def _drain(self):
+        while self.released:
+            self._unref(self.released.popleft())
+
+    def _unref(self, doc_hash):
+        if doc_hash in self.refs:
+            self.refs[doc_hash] = max(0, self.refs[doc_hash] - 1)
+
+    def _evict(self):
+        loaded = {
+            doc_hash: future.result() for doc_hash, future in self.docs.items()
+            if future.done() and future.exception() is None
+        }
+        total = sum(d.nbytes() for d in loaded.values())
+        for doc_hash, document in loaded.items():
+            if total <= self.max_bytes:
+                break
+            if self.refs.get(doc_hash, 0) == 0:
+                del self.docs[doc_hash]
+                self.refs.pop(doc_hash, None)
+                total -= document.nbytes()
@@ -0,0 +1,133 @@
+import os
+import json
+import shutil
+import tempfile
+import numpy as np
+from docstore import data_path, load_structured_data
+
+COLUMNS_DIR = "columns"
+
+
+def build_columns(elements):
+    """Converts Adobe elements into the columns the viewer needs.
+
+    Returns page (int32, -1 if absent), bounds (float32 n x 4, NaN if absent),
+    path ids into an interned path table, offsets into one UTF-8 text buffer
+    and a has_text mask for elements that carry a `Text` key.
+    """
+    n = len(elements)
+    page = np.full(n, -1, dtype=np.int32)
+    bounds = np.full((n, 4), np.nan, dtype=np.float32)
+    path_id = np.zeros(n, dtype=np.int32)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    has_text = np.zeros(n, dtype=bool)
+    paths, path_ids = [], {}
+    chunks, pos = [], 0
+
+    for i, el in enumerate(elements):
+        if el.get("Page") is not None:
+            page[i] = el["Page"]
+        if "Bounds" in el:
+            bounds[i] = el["Bounds"]
+        p = el.get("Path", "")
+        if p not in path_ids:
+            path_ids[p] = len(paths)
+            paths.append(p)
+        path_id[i] = path_ids[p]
+        if "Text" in el:
+            has_text[i] = True
+            b = el["Text"].encode("utf-8")
+            chunks.append(b)
+            pos += len(b)
+        offsets[i + 1] = pos
+
+    text = np.frombuffer(b"".join(chunks), dtype=np.uint8)
+    return {"page": page, "bounds": bounds, "path_id": path_id, "offsets": offsets, "has_text": has_text, "text": text}, paths
+
+
+def write_columns(outdir, columns, paths):
+    """Writes the columns as .npy files, replacing the whole directory atomically."""
+    work = tempfile.mkdtemp(prefix=".columns-", dir=outdir)
+    for name, arr in columns.items():
+        np.save(os.path.join(work, f"{name}.npy"), arr)
+    with open(os.path.join(work, "paths.json"), "w") as f:
+        json.dump(paths, f)
+    try:
+        os.rename(work, os.path.join(outdir, COLUMNS_DIR))
+    except OSError:
+        # Another session built the same columns first.
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _map(path):
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # Zero-length arrays cannot be memory-mapped.
+        return np.load(path)
+
+
+class ElementStore:
+    """Read-only, list-like view over memory-mapped element columns.
+
+    Indexing yields the same `Text`/`Page`/`Bounds`/`Path` dicts the viewer
+    used from structuredData.json, built on demand from the mapped arrays.
+    """
+
+    def __init__(self, columns, paths):
+        self.page = columns["page"]
+        self.bounds = columns["bounds"]
+        self.path_id = columns["path_id"]
+        self.offsets = columns["offsets"]
+        self.has_text = columns["has_text"]
+        self.text_buf = columns["text"]
+        self.paths = paths
+
+    @classmethod
+    def load(cls, outdir):
+        """Maps the cached columns beside structuredData.json, building them on first use."""
+        col_dir = os.path.join(outdir, COLUMNS_DIR)
+        source = data_path(outdir)
+        if os.path.isdir(col_dir) and source and os.path.getmtime(col_dir) < os.path.getmtime(source):
+            shutil.rmtree(col_dir, ignore_errors=True)
+        if not os.path.isdir(col_dir):
+            data = load_structured_data(outdir) or {}
+            write_columns(outdir, *build_columns(data.get("elements", [])))
+        columns = {
+            name[:-4]: _map(os.path.join(col_dir, name))
+            for name in os.listdir(col_dir) if name.endswith(".npy")
+        }
+        with open(os.path.join(col_dir, "paths.json")) as f:
+            paths = json.load(f)
+        return cls(columns, paths)
+
+    def __len__(self):
+        return len(self.page)
+
+    def nbytes(self):
+        arrays = (self.page, self.bounds, self.path_id, self.offsets, self.has_text, self.text_buf)
+        return sum(a.nbytes for a in arrays)
+
+    def text(self, i):
+        if not self.has_text[i]:
+            return None
+        return bytes(self.text_buf[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        el = {"Path": self.paths[self.path_id[i]]}
+        if self.page[i] >= 0:
+            el["Page"] = int(self.page[i])
+        if not np.isnan(self.bounds[i, 0]):
+            el["Bounds"] = [float(v) for v in self.bounds[i]]
+        text = self.text(i)
+        if text is not None:
+            el["Text"] = text
+        return el
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
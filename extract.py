@@ -1,6 +1,7 @@
 import os
 import json
 import logging
+from io import BytesIO
 from zipfile import ZipFile
 from dotenv import load_dotenv
 from adobe.pdfservices.operation.auth.service_principal_credentials import ServicePrincipalCredentials
@@ -14,10 +15,14 @@ from adobe.pdfservices.operation.pdfjobs.params.extract_pdf.extract_pdf_params i
 from adobe.pdfservices.operation.pdfjobs.result.extract_pdf_result import ExtractPDFResult
 from adobe.pdfservices.operation.exception.exceptions import ServiceApiException, ServiceUsageException, SdkException
 
+from docstore import DATA_NAME, write_atomic, write_structured_data
+
 load_dotenv()
 
+EXTRACT_MEMBERS = ("tables/",)
+
 class ExtractTextInfoFromPDF:
-    def __init__(self, output_path="output/ExtractTextInfoFromPDF/structuredData.json"):
+    def __init__(self, output_path="output/ExtractTextInfoFromPDF/structuredData.json", input_stream=None):
         try:
             credentials = ServicePrincipalCredentials(
                         client_id=os.getenv('PDF_SERVICES_CLIENT_ID'),
@@ -25,8 +30,9 @@ class ExtractTextInfoFromPDF:
                     )
 
 
-            with open("extractPdfInput.pdf", "rb") as file:
-                input_stream = file.read()
+            if input_stream is None:
+                with open("extractPdfInput.pdf", "rb") as file:
+                    input_stream = file.read()
 
             pdf_services = PDFServices(credentials=credentials)
             input_asset = pdf_services.upload(input_stream=input_stream, mime_type=PDFServicesMediaType.PDF)
@@ -50,20 +56,18 @@ class ExtractTextInfoFromPDF:
             output_dir = os.path.dirname(output_path)
             os.makedirs(output_dir, exist_ok=True)
 
-            zip_path = os.path.join(output_dir, "temp_extract.zip")
-            with open(zip_path, "wb") as file:
-                file.write(stream_asset.get_input_stream())
-
-            with ZipFile(zip_path, 'r') as archive:
-                archive.extractall(output_dir)
-
-            with open(os.path.join(output_dir, "structuredData.json"), "r") as json_out:
-                json_data = json.load(json_out)
+            # Read the result zip straight from memory and unpack only the members
+            # the app uses; every file lands via an atomic rename.
+            with ZipFile(BytesIO(stream_asset.get_input_stream())) as archive:
+                for name in archive.namelist():
+                    if name.startswith(EXTRACT_MEMBERS) and not name.endswith("/"):
+                        os.makedirs(os.path.join(output_dir, os.path.dirname(name)), exist_ok=True)
+                        write_atomic(os.path.join(output_dir, name), archive.read(name))
 
-            with open(output_path, "w") as f:
-                json.dump(json_data, f, indent=2)
+                with archive.open(DATA_NAME) as json_out:
+                    json_data = json.load(json_out)
 
-            os.remove(zip_path)
+            write_structured_data(output_dir, json_data)
 
         except (ServiceApiException, ServiceUsageException, SdkException) as e:
             logging.exception(f"Exception encountered while executing operation: {e}")
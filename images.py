@@ -0,0 +1,69 @@
+import os
+import glob
+import json
+from docstore import write_atomic
+
+CATALOG_NAME = "catalog.json"
+
+
+class ImageCatalog:
+    """Catalog of a PDF's embedded images, deduplicated by xref.
+
+    The pages are scanned for xref, page and bounding-box metadata the first
+    time the catalog is used (and the result kept in
+    `<outdir>/images/catalog.json`); image bytes are extracted when first
+    requested and cached as files beside the catalog.
+    """
+
+    def __init__(self, doc, lock, outdir):
+        self.doc = doc
+        self.lock = lock
+        self.image_dir = os.path.join(outdir, "images")
+        self._entries = None
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            catalog_path = os.path.join(self.image_dir, CATALOG_NAME)
+            try:
+                with open(catalog_path) as f:
+                    self._entries = {int(k): v for k, v in json.load(f).items()}
+            except (OSError, ValueError):
+                entries = self._scan()
+                os.makedirs(self.image_dir, exist_ok=True)
+                write_atomic(catalog_path, json.dumps(entries).encode("utf-8"))
+                self._entries = entries
+        return self._entries
+
+    def _scan(self):
+        entries = {}
+        with self.lock:
+            for page_index, page in enumerate(self.doc):
+                for img in page.get_images(full=True):
+                    xref = img[0]
+                    entry = entries.setdefault(
+                        xref, {"xref": xref, "width": img[2], "height": img[3], "pages": [], "bboxes": []}
+                    )
+                    if page_index in entry["pages"]:
+                        continue
+                    entry["pages"].append(page_index)
+                    rects = page.get_image_rects(xref)
+                    entry["bboxes"].append(list(rects[0]) if rects else None)
+        return entries
+
+    def on_page(self, page):
+        """Returns the catalog entries of images shown on a page."""
+        return [e for e in self.entries.values() if page in e["pages"]]
+
+    def load(self, xref):
+        """Returns (image bytes, extension) for an xref, extracting it on first use."""
+        for path in glob.glob(os.path.join(self.image_dir, f"{xref}.*")):
+            if not path.endswith((".json", ".tmp")):
+                with open(path, "rb") as f:
+                    return f.read(), os.path.splitext(path)[1][1:]
+        with self.lock:
+            base_image = self.doc.extract_image(xref)
+        os.makedirs(self.image_dir, exist_ok=True)
+        path = os.path.join(self.image_dir, f"{xref}.{base_image['ext']}")
+        write_atomic(path, base_image["image"])
+        return base_image["image"], base_image["ext"]
@@ -0,0 +1,213 @@
+import os
+import re
+import json
+import math
+import logging
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from chunker import HEADING_TAGS, path_tag
+from docstore import data_version, write_atomic
+from llm import summarize_batch
+
+COMMON_WORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "common_words.txt")
+JARGON_NAME = "jargon.json"
+MAX_TERMS = 60
+MIN_WORD_LENGTH = 5
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9-]*[A-Za-z0-9]")
+_ACRONYM = re.compile(r"\b[A-Za-z]*[A-Z][a-z]*[A-Z][A-Za-z0-9]*\b")
+_URL = re.compile(r"(?:https?://|www\.|doi:|arxiv:)\S+", re.IGNORECASE)
+_REFERENCES = re.compile(r"^(?:[\dIVX]+\.?\s*)?(?:references|bibliography|works cited)$", re.IGNORECASE)
+_DEFINED = re.compile(r"((?:[A-Za-z][\w-]*\s+){1,8})\(([A-Za-z]*[A-Z][a-z]*[A-Z][A-Za-z0-9]*)s?\)")
+
+
+def load_common_words(path=COMMON_WORDS_PATH):
+    words = set()
+    with open(path) as f:
+        for line in f:
+            if not line.startswith("#"):
+                words.update(line.lower().split())
+    return words
+
+
+def _expansion(words, acronym, max_extra_words=2):
+    """Finds the long form ending at the last word whose initials spell the acronym.
+
+    The acronym's capitals are matched right to left against the initials of
+    the preceding words and their hyphen parts, skipping parts that do not
+    match ("Weight-Decomposed Low-Rank Adaptation" for DoRA). Returns None if
+    the capitals are not all matched within a few extra words.
+    """
+    needed = [c.lower() for c in acronym if c.isupper()]
+    taken = []
+    for word in reversed(words[-(len(needed) + max_extra_words):]):
+        taken.insert(0, word)
+        for part in reversed([p for p in word.split("-") if p]):
+            if needed and part[0].lower() == needed[-1]:
+                needed.pop()
+        if not needed:
+            return " ".join(taken)
+    return None
+
+
+def _body_text(el, in_references):
+    """Returns the element text without URLs, or "" inside the references section."""
+    if in_references:
+        return ""
+    return _URL.sub(" ", el.get("Text", ""))
+
+
+def extract_terms(elements, common, max_terms=MAX_TERMS):
+    """Finds candidate jargon in one pass over the elements.
+
+    Candidates are acronyms, uncommon words and uncommon two-word phrases,
+    ranked by term frequency times inverse element frequency within the
+    document. Terms are compared case-insensitively (an acronym keeps its
+    spelling), and URLs and the references section are skipped. Returns a
+    dict mapping each kept term to its element occurrences and, for acronyms
+    defined in the text as "Long Form (LF)", the expansion.
+    """
+    tf, df = Counter(), Counter()
+    occurrences = defaultdict(list)
+    acronyms, expansions = {}, {}
+    n_docs = 0
+    in_references = False
+
+    for i, el in enumerate(elements):
+        if path_tag(el.get("Path", "")) in HEADING_TAGS:
+            in_references = bool(_REFERENCES.match(el.get("Text", "").strip()))
+        text = _body_text(el, in_references)
+        if not text.strip():
+            continue
+        n_docs += 1
+        candidates = []
+        for m in _DEFINED.finditer(text):
+            acronym = m.group(2)
+            expansion = _expansion(m.group(1).split(), acronym)
+            if expansion:
+                expansions.setdefault(acronym.lower(), expansion)
+        for acronym in _ACRONYM.findall(text):
+            acronyms.setdefault(acronym.lower(), acronym)
+            candidates.append(acronym.lower())
+        found = set(candidates)
+        words = [w.lower() for w in _WORD.findall(text)]
+        candidates += [w for w in words if len(w) >= MIN_WORD_LENGTH and w not in common and w not in found]
+        candidates += [
+            f"{a} {b}" for a, b in zip(words, words[1:])
+            if a != b and len(a) > 3 and len(b) > 3 and a not in common and b not in common
+        ]
+        tf.update(candidates)
+        for term in set(candidates):
+            df[term] += 1
+            occurrences[term].append(i)
+
+    def score(term):
+        weight = 2.0 if term in acronyms else 1.0
+        return weight * tf[term] * math.log(1 + n_docs / df[term])
+
+    ranked = sorted((t for t in tf if tf[t] >= 2 or t in expansions), key=score, reverse=True)
+    return {
+        acronyms.get(term, term): {"occurrences": occurrences[term], "expansion": expansions.get(term)}
+        for term in ranked[:max_terms]
+    }
+
+
+class JargonIndex:
+    """Term -> element occurrences, with the reverse element -> terms lookup."""
+
+    def __init__(self, terms):
+        self.terms = terms
+        self.by_element = defaultdict(list)
+        for term, info in terms.items():
+            for i in info["occurrences"]:
+                self.by_element[i].append(term)
+
+    def terms_in(self, idx):
+        return self.by_element.get(idx, [])
+
+    def definition(self, term):
+        return self.terms.get(term, {}).get("definition")
+
+
+class JargonService:
+    """Builds each document's jargon index in the background.
+
+    The local pass is written to jargon.json in the hash directory first, so
+    terms can be highlighted immediately; definitions for all unique terms are
+    then generated in a few batched requests and added to the same file. The
+    file is tagged with the structuredData version it was built from, and a
+    result is dropped if the extraction was replaced while it ran.
+    """
+
+    def __init__(self, client, workers=1):
+        self.client = client
+        self.common = load_common_words()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.running = set()
+        self.lock = threading.Lock()
+
+    def path(self, outdir):
+        return os.path.join(outdir, JARGON_NAME)
+
+    def _read(self, outdir, version):
+        try:
+            with open(self.path(outdir)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data["terms"] if isinstance(data, dict) and data.get("version") == version else None
+
+    def load(self, outdir, version):
+        """Returns the document's JargonIndex, or None before the local pass has finished."""
+        terms = self._read(outdir, version)
+        return JargonIndex(terms) if terms is not None else None
+
+    def pending(self, outdir):
+        return any(key[0] == outdir for key in self.running)
+
+    def submit(self, outdir, elements, version):
+        key = (outdir, version)
+        with self.lock:
+            if key in self.running:
+                return
+            terms = self._read(outdir, version)
+            if terms is not None and all(info.get("definition") for info in terms.values()):
+                return
+            self.running.add(key)
+        self.pool.submit(self._run, outdir, elements, version)
+
+    def _write(self, outdir, terms, version):
+        if data_version(outdir) != version:
+            logging.info(f"Dropping jargon for a replaced extraction of {outdir}")
+            return False
+        write_atomic(self.path(outdir), json.dumps({"version": version, "terms": terms}).encode("utf-8"))
+        return True
+
+    def _run(self, outdir, elements, version):
+        try:
+            terms = extract_terms(elements, self.common)
+            if not self._write(outdir, terms, version):
+                return
+            items = []
+            for term, info in terms.items():
+                context = elements[info["occurrences"][0]].get("Text", "")[:300]
+                if info["expansion"]:
+                    context = f"{term} stands for {info['expansion']}. {context}"
+                items.append((term, context))
+            definitions = summarize_batch(
+                self.client,
+                items,
+                "You are a helpful assistant that explains research jargon to non-experts.",
+                task="For each term below (shown with a sentence where it is used), explain its meaning, "
+                     "the concept behind it and a plain-language version in 2-3 sentences.",
+                tokens_per_summary=120
+            )
+            for term, info in terms.items():
+                info["definition"] = definitions.get(term)
+            self._write(outdir, terms, version)
+        except Exception:
+            logging.exception(f"Jargon extraction failed for {outdir}")
+        finally:
+            with self.lock:
+                self.running.discard((outdir, version))
@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from docstore import data_path, load_structured_data, invalidate_derived
+from local_extract import extract_pdf
+
+EXTRACT_ROOT = "output/ExtractTextInfoFromPDF"
+EXTRACT_MODE = os.getenv("CONFER_EXTRACT_MODE", "cloud")
+EXTRACT_WORKERS = int(os.getenv("CONFER_EXTRACT_WORKERS", "2"))
+
+
+def cloud_backend(pdf_bytes, outdir):
+    """Runs the Adobe PDF Services extraction."""
+    from extract import ExtractTextInfoFromPDF
+    ExtractTextInfoFromPDF(output_path=os.path.join(outdir, "structuredData.json"), input_stream=pdf_bytes)
+
+
+BACKENDS = {"cloud": cloud_backend, "local": extract_pdf}
+MODES = {"cloud": ["cloud"], "local": ["local"], "progressive": ["local", "cloud"]}
+
+
+class ExtractionJobs:
+    """Runs structure extraction in background workers.
+
+    Job status is persisted as `job.json` in the document's hash directory,
+    so any session (or a restarted process) can poll it, and concurrent
+    submissions of the same document share a single job.
+
+    A job runs one or more backend stages: in progressive mode the local
+    PyMuPDF pass makes elements available at once (state "refining") while
+    the cloud pass replaces them when it finishes.
+
+    Listeners are called with (doc_hash, outdir) from the worker each time
+    a stage produces a new structuredData.json.
+    """
+
+    def __init__(self, stages=None, root=EXTRACT_ROOT, workers=EXTRACT_WORKERS, mode=EXTRACT_MODE, listeners=()):
+        self.stages = stages or [BACKENDS[name] for name in MODES[mode]]
+        self.listeners = list(listeners)
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.running = {}
+        self.lock = threading.Lock()
+
+    def outdir(self, doc_hash):
+        return os.path.join(self.root, doc_hash)
+
+    def extracted(self, doc_hash):
+        return data_path(self.outdir(doc_hash)) is not None
+
+    def _write_status(self, doc_hash, state, **extra):
+        path = os.path.join(self.outdir(doc_hash), "job.json")
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"state": state, "updated": time.time(), **extra}, f)
+        os.replace(tmp, path)
+
+    def status(self, doc_hash):
+        """Returns the job status dict: state is queued, running, refining, done, failed or missing."""
+        try:
+            with open(os.path.join(self.outdir(doc_hash), "job.json")) as f:
+                status = json.load(f)
+        except (OSError, ValueError):
+            status = {"state": "missing"}
+        if self.extracted(doc_hash):
+            if status["state"] == "refining" and doc_hash in self.running:
+                return status
+            return {"state": "done"}
+        if status["state"] in ("queued", "running", "refining") and doc_hash not in self.running:
+            # Left behind by a process that stopped before finishing.
+            return {"state": "missing"}
+        return status
+
+    def submit(self, doc_hash, pdf_bytes):
+        """Queues extraction unless the document is already extracted or in flight."""
+        with self.lock:
+            if doc_hash in self.running or self.extracted(doc_hash):
+                return self.status(doc_hash)
+            os.makedirs(self.outdir(doc_hash), exist_ok=True)
+            self._write_status(doc_hash, "queued", submitted=time.time())
+            self.running[doc_hash] = self.pool.submit(self._run, doc_hash, pdf_bytes)
+        return self.status(doc_hash)
+
+    def _run(self, doc_hash, pdf_bytes):
+        started = time.time()
+        outdir = self.outdir(doc_hash)
+        try:
+            for n, stage in enumerate(self.stages):
+                if n == 0:
+                    self._write_status(doc_hash, "running", started=started)
+                    stage(pdf_bytes, outdir)
+                    if not self.extracted(doc_hash):
+                        raise RuntimeError("Extraction produced no structuredData.json")
+                    self._notify(doc_hash, outdir)
+                    continue
+                # Later stages refine an already usable result; their failure is not fatal.
+                self._write_status(doc_hash, "refining", started=started)
+                before = os.path.getmtime(data_path(outdir))
+                try:
+                    stage(pdf_bytes, outdir)
+                except Exception:
+                    logging.exception(f"Refining extraction failed for {doc_hash}")
+                if os.path.getmtime(data_path(outdir)) != before:
+                    invalidate_derived(outdir)
+                    self._notify(doc_hash, outdir)
+            self._write_status(doc_hash, "done", started=started, finished=time.time())
+        except Exception as e:
+            logging.exception(f"Extraction failed for {doc_hash}")
+            self._write_status(doc_hash, "failed", started=started, error=str(e))
+        finally:
+            with self.lock:
+                self.running.pop(doc_hash, None)
+
+    def _notify(self, doc_hash, outdir):
+        for listener in self.listeners:
+            try:
+                listener(doc_hash, outdir)
+            except Exception:
+                logging.exception(f"Extraction listener failed for {doc_hash}")
+
+    def result(self, doc_hash):
+        """Returns the parsed structuredData.json, or None while extraction is pending."""
+        return load_structured_data(self.outdir(doc_hash))
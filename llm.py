@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from llm_cache import LLMCache, cache_key
+from chunker import count_tokens
+from openai import RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+
+MODEL = "gpt-3.5-turbo"
+MAX_CONCURRENCY = int(os.getenv("CONFER_LLM_CONCURRENCY", "4"))
+MAX_RETRIES = 5
+REDUCE_MAX_CHARS = 8000
+SUMMARIZE_TASK = "Summarize each of the following parts."
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+    return _cache
+
+
+def _retry_after(error):
+    """Returns the server-suggested wait in seconds, if the error carries one."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _create(client, retries, **kwargs):
+    """Calls the completions endpoint, backing off on rate limits and transient errors.
+
+    The SDK's own retries are turned off so `retries` is the whole retry budget.
+    """
+    client = client.with_options(max_retries=0)
+    delay = 1.0
+    for attempt in range(retries + 1):
+        try:
+            return client.chat.completions.create(**kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == retries:
+                raise
+            wait = _retry_after(e) or delay * (1 + random.random())
+            logging.warning(f"LLM call failed ({type(e).__name__}), retrying in {wait:.1f}s")
+            time.sleep(wait)
+            delay = min(delay * 2, 60)
+
+
+def complete(client, messages, temperature=0.3, max_tokens=500, model=MODEL, retries=MAX_RETRIES, use_cache=True, json_mode=False):
+    """Runs one chat completion through the response cache, with retries.
+
+    json_mode asks the model for a single JSON object.
+    """
+    extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+    key = cache_key(model, messages, temperature, max_tokens, **extra)
+    if use_cache:
+        cached = get_cache().get(key)
+        if cached is not None:
+            return cached
+
+    response = _create(client, retries, model=model, messages=messages, temperature=temperature, max_tokens=max_tokens, **extra)
+    content = response.choices[0].message.content.strip()
+    if use_cache:
+        get_cache().put(key, content)
+    return content
+
+
+def stream_complete(client, messages, temperature=0.3, max_tokens=500, model=MODEL, retries=MAX_RETRIES, use_cache=True):
+    """Yields a chat completion as text deltas (a cached answer comes as one piece).
+
+    Retries apply until the stream opens; the full text is cached once the
+    stream has been consumed.
+    """
+    key = cache_key(model, messages, temperature, max_tokens)
+    if use_cache:
+        cached = get_cache().get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    stream = _create(
+        client, retries,
+        model=model, messages=messages, temperature=temperature, max_tokens=max_tokens, stream=True
+    )
+    parts = []
+    for event in stream:
+        delta = event.choices[0].delta.content if event.choices else None
+        if delta:
+            parts.append(delta)
+            yield delta
+    if use_cache:
+        get_cache().put(key, "".join(parts).strip())
+
+
+def _summarize_chunk(client, chunk):
+    return complete(
+        client,
+        [{"role": "user", "content": f"Summarize this part of a research paper:\n\n{chunk}"}],
+        temperature=0.3,
+        max_tokens=500
+    )
+
+
+def _combine(client, summaries, stream=False):
+    combined_summary_text = "\n".join(summaries)
+    return (stream_complete if stream else complete)(
+        client,
+        [
+            {"role": "system", "content": "You are a helpful assistant that combines summaries into one final summary."},
+            {"role": "user", "content": f"Combine and summarize the following summaries:\n\n{combined_summary_text}"}
+        ],
+        temperature=0.3,
+        max_tokens=500
+    )
+
+
+def _group(summaries, max_chars):
+    """Packs summaries into groups that fit one combine request (at least two per group)."""
+    groups, current, size = [], [], 0
+    for s in summaries:
+        if len(current) >= 2 and size + len(s) > max_chars:
+            groups.append(current)
+            current, size = [], 0
+        current.append(s)
+        size += len(s) + 1
+    if current:
+        groups.append(current)
+    return groups
+
+
+def map_reduce_summary(client, chunks, concurrency=MAX_CONCURRENCY, reduce_max_chars=REDUCE_MAX_CHARS, stream=False):
+    """Summarizes chunks concurrently, then combines the summaries hierarchically
+    until they fit into a single final combine request.
+
+    With stream=True the final combine is returned as a generator of text deltas.
+    """
+    if not chunks:
+        return iter(()) if stream else ""
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        summaries = list(pool.map(lambda c: _summarize_chunk(client, c), chunks))
+
+        while len(summaries) > 1 and sum(len(s) + 1 for s in summaries) > reduce_max_chars:
+            groups = _group(summaries, reduce_max_chars)
+            summaries = list(pool.map(lambda g: _combine(client, g), groups))
+
+    return _combine(client, summaries, stream)
+
+
+def _pack(items, max_input_tokens):
+    """Packs (id, text) items into batches whose combined text fits max_input_tokens."""
+    batches, current, size = [], [], 0
+    for item_id, text in items:
+        n = count_tokens(text)
+        if current and size + n > max_input_tokens:
+            batches.append(current)
+            current, size = [], 0
+        current.append((item_id, text))
+        size += n
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _summarize_packed(client, batch, instructions, context, tokens_per_summary, task=SUMMARIZE_TASK):
+    body = "\n\n".join(f"### {item_id}\n{text}" for item_id, text in batch)
+    ids = ", ".join(f'"{item_id}"' for item_id, _ in batch)
+    user = f"Here is the overall context: {context}\n\n" if context else ""
+    user += (
+        f"{task} Reply with one JSON object whose keys are "
+        f"exactly {ids} and whose values are the summaries.\n\n{body}"
+    )
+    content = complete(
+        client,
+        [
+            {"role": "system", "content": f"{instructions} Always answer with valid JSON."},
+            {"role": "user", "content": user}
+        ],
+        temperature=0.3,
+        max_tokens=min(4000, tokens_per_summary * len(batch) + 50),
+        json_mode=True
+    )
+    try:
+        result = json.loads(content)
+    except ValueError:
+        logging.warning("Batched summary was not valid JSON")
+        return {}
+    wanted = {str(item_id): item_id for item_id, _ in batch}
+    return {wanted[k]: str(v).strip() for k, v in result.items() if k in wanted}
+
+
+def summarize_batch(client, items, instructions, context="", max_input_tokens=6000,
+                    tokens_per_summary=150, concurrency=MAX_CONCURRENCY, task=SUMMARIZE_TASK):
+    """Summarizes many (id, text) items with as few requests as the token budget allows.
+
+    Items are packed into JSON-output requests that share one copy of the
+    context; items a batch fails to return are retried one per request.
+    `task` replaces the per-part instruction, e.g. to define terms instead.
+    Returns a dict mapping id -> summary.
+    """
+    budget = max(500, max_input_tokens - count_tokens(context))
+    batches = _pack(items, budget)
+    summaries = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        run = lambda b: _summarize_packed(client, b, instructions, context, tokens_per_summary, task)
+        for result in pool.map(run, batches):
+            summaries.update(result)
+        retry = [[item] for b in batches if len(b) > 1 for item in b if item[0] not in summaries]
+        for result in pool.map(run, retry):
+            summaries.update(result)
+    return summaries
@@ -0,0 +1,75 @@
+import os
+import statistics
+import fitz
+from docstore import write_structured_data
+from pdf_workers import pdf_pool, worker_doc
+
+LOCAL_WORKERS = int(os.getenv("CONFER_LOCAL_WORKERS", str(os.cpu_count() or 1)))
+PAGES_PER_TASK = 8
+
+def _extract_range(first, last):
+    return _extract_pages(worker_doc(), first, last)
+
+
+def _extract_pages(doc, first, last):
+    """Returns the text blocks of pages [first, last) as (page, bounds, text, size) tuples."""
+    blocks, pages = [], []
+    for page_index in range(first, last):
+        page = doc[page_index]
+        height = page.rect.height
+        pages.append({"page_number": page_index, "width": page.rect.width, "height": height})
+        for block in page.get_text("dict")["blocks"]:
+            if block.get("type") != 0:
+                continue
+            lines, size = [], 0.0
+            for line in block["lines"]:
+                spans = line["spans"]
+                lines.append("".join(span["text"] for span in spans))
+                size = max([size] + [span["size"] for span in spans])
+            text = " ".join(l.strip() for l in lines).strip()
+            if text:
+                x0, y0, x1, y1 = block["bbox"]
+                blocks.append((page_index, [x0, height - y1, x1, height - y0], text, size))
+    return blocks, pages
+
+
+def _path(text, size, body_size):
+    """Guesses the Adobe-style path of a block from its font size relative to body text."""
+    if len(text) < 200 and size >= body_size * 1.5:
+        return "//Document/H1"
+    if len(text) < 200 and size >= body_size * 1.15:
+        return "//Document/H2"
+    return "//Document/P"
+
+
+def extract_pdf(pdf_bytes, outdir, workers=LOCAL_WORKERS):
+    """Extracts text blocks with PyMuPDF into the structuredData.json `elements` schema.
+
+    Pages are split across a process pool in ranges of PAGES_PER_TASK.
+    """
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    page_count = len(doc)
+    ranges = [(start, min(start + PAGES_PER_TASK, page_count)) for start in range(0, page_count, PAGES_PER_TASK)]
+
+    blocks, pages = [], []
+    if workers > 1 and len(ranges) > 1:
+        with pdf_pool(pdf_bytes, min(workers, len(ranges))) as pool:
+            for b, p in pool.map(_extract_range, *zip(*ranges)):
+                blocks.extend(b)
+                pages.extend(p)
+    else:
+        for first, last in ranges:
+            b, p = _extract_pages(doc, first, last)
+            blocks.extend(b)
+            pages.extend(p)
+
+    body_size = statistics.median(size for *_, size in blocks) if blocks else 10.0
+    elements = [
+        {"Bounds": bounds, "Page": page, "Path": _path(text, size, body_size), "Text": text, "TextSize": size}
+        for page, bounds, text, size in blocks
+    ]
+    write_structured_data(outdir, {
+        "extended_metadata": {"extractor": "local"},
+        "elements": elements,
+        "pages": pages
+    })
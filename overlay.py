@@ -0,0 +1,38 @@
+import os
+import streamlit as st
+import streamlit.components.v1 as components
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "overlay_frontend")
+
+_component = components.declare_component("page_overlay", path=FRONTEND_DIR)
+
+
+def page_overlay(cache_key, image, layout, width, height, active=None, key="page_overlay"):
+    """Shows a page with its element boxes drawn client-side; returns the clicked element index or None.
+
+    The image data URI and the layout payload are sent to the browser only
+    the first time this session shows `cache_key` (document hash, version and
+    page); later reruns send just the key and the active element. If the
+    browser has lost its copy it asks for it again.
+    """
+    sent = st.session_state.setdefault("overlay_sent", set())
+    fresh = cache_key not in sent
+    event = _component(
+        cache_key=cache_key,
+        image=image() if fresh else None,
+        boxes=layout.payload() if fresh else None,
+        width=width,
+        height=height,
+        active=active,
+        key=key,
+        default=None
+    )
+    sent.add(cache_key)
+
+    if not event or event.get("seq") == st.session_state.get("overlay_seq"):
+        return None
+    st.session_state.overlay_seq = event["seq"]
+    if "missing" in event:
+        sent.discard(event["missing"])
+        st.rerun(scope="fragment")
+    return event.get("selected")
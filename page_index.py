@@ -0,0 +1,48 @@
+from collections import defaultdict
+
+
+class PageLayout:
+    """Screen rectangles of one page's elements, as (index, x, y, w, h)."""
+
+    def __init__(self, rects):
+        self.rects = rects
+        self._payload = None
+
+    def payload(self):
+        """Returns the rectangles as compact [index, x, y, w, h] rows for the client-side overlay."""
+        if self._payload is None:
+            self._payload = [[i, round(x, 1), round(y, 1), round(w, 1), round(h, 1)] for i, x, y, w, h in self.rects]
+        return self._payload
+
+
+class PageIndex:
+    """Groups elements with `Bounds` by page, built once after parsing.
+
+    Screen layouts are computed per (page, scale) on first use and reused, so
+    per-page loops only touch the elements on that page.
+    """
+
+    def __init__(self, elements, sizes):
+        self.sizes = sizes
+        self.by_page = defaultdict(list)
+        self.bounds = {}
+        for i, el in enumerate(elements):
+            if "Bounds" in el and el.get("Page") is not None:
+                self.by_page[el["Page"]].append(i)
+                self.bounds[i] = el["Bounds"]
+        self._layouts = {}
+
+    def elements_on(self, page):
+        return self.by_page.get(page, [])
+
+    def layout(self, page, scale_x, scale_y):
+        key = (page, round(scale_x, 6), round(scale_y, 6))
+        layout = self._layouts.get(key)
+        if layout is None:
+            h_pts = self.sizes[page][1]
+            rects = []
+            for i in self.elements_on(page):
+                l, b, r, t = self.bounds[i]
+                rects.append((i, l * scale_x, (h_pts - t) * scale_y, (r - l) * scale_x, (t - b) * scale_y))
+            layout = self._layouts[key] = PageLayout(rects)
+        return layout
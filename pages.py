@@ -0,0 +1,164 @@
+import os
+import base64
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import fitz
+from PIL import Image
+from docstore import write_atomic
+from pdf_workers import pdf_pool, worker_doc
+
+DISPLAY_WIDTH = 612
+MEMORY_PAGES = 6
+PREFETCH = 1
+PAGE_FORMAT = os.getenv("CONFER_PAGE_FORMAT", "PNG").upper()
+PAGE_QUALITY = int(os.getenv("CONFER_PAGE_QUALITY", "80"))
+ENCODED_PAGES = 256
+RENDER_WORKERS = int(os.getenv("CONFER_RENDER_WORKERS", str(os.cpu_count() or 1)))
+PAGES_PER_TASK = 4
+
+_MIME = {"PNG": "image/png", "WEBP": "image/webp", "JPEG": "image/jpeg"}
+_encoded = OrderedDict()
+_encoded_lock = threading.Lock()
+
+def _render_range(pages, width, page_dir):
+    """Renders the given pages to PNGs in page_dir; returns how many were rendered."""
+    for page in pages:
+        p = worker_doc()[page]
+        zoom = width / p.rect.width
+        pix = p.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        write_atomic(os.path.join(page_dir, f"{page}.png"), pix.tobytes("png"))
+    return len(pages)
+
+
+class PageRenderer:
+    """Rasterizes PDF pages on demand.
+
+    Rendered pages are kept in a small in-memory LRU and written as PNGs to
+    `<cache_dir>/pages/<width>/`, so memory stays bounded regardless of the
+    page count and later sessions on the same document reuse the files.
+    """
+
+    def __init__(self, pdf_bytes, cache_dir, width=DISPLAY_WIDTH, memory_pages=MEMORY_PAGES, prefetch=PREFETCH):
+        self.pdf_bytes = pdf_bytes
+        self.doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        self.page_count = len(self.doc)
+        # Page sizes in points, read once: the fitz document is shared with the prefetch thread.
+        self.page_sizes = [(p.rect.width, p.rect.height) for p in self.doc]
+        self.width = width
+        self.memory_pages = memory_pages
+        self.prefetch_pages = prefetch
+        self.doc_hash = os.path.basename(os.path.normpath(cache_dir))
+        self.page_dir = os.path.join(cache_dir, "pages", str(width))
+        os.makedirs(self.page_dir, exist_ok=True)
+        self._images = OrderedDict()
+        self.lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1)
+
+    def __len__(self):
+        return self.page_count
+
+    def _path(self, page):
+        return os.path.join(self.page_dir, f"{page}.png")
+
+    def size(self, page):
+        """Returns the rendered (width, height) of a page without rasterizing it."""
+        w_pts, h_pts = self.page_sizes[page]
+        return self.width, round(h_pts * self.width / w_pts)
+
+    def _rasterize(self, page):
+        path = self._path(page)
+        if os.path.exists(path):
+            return Image.open(path).convert("RGB")
+        with self.lock:
+            p = self.doc[page]
+            zoom = self.width / p.rect.width
+            pix = p.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        buf = BytesIO()
+        image.save(buf, format="PNG")
+        write_atomic(path, buf.getvalue())
+        return image
+
+    def _remember(self, page, image):
+        with self.lock:
+            self._images[page] = image
+            self._images.move_to_end(page)
+            while len(self._images) > self.memory_pages:
+                self._images.popitem(last=False)
+
+    def _warm(self, page):
+        if page not in self._images:
+            self._remember(page, self._rasterize(page))
+
+    def get(self, page):
+        """Returns the PIL image of a page and prefetches its neighbours in the background."""
+        image = self._images.get(page)
+        if image is None:
+            image = self._rasterize(page)
+        self._remember(page, image)
+
+        for delta in range(1, self.prefetch_pages + 1):
+            for neighbour in (page + delta, page - delta):
+                if 0 <= neighbour < self.page_count and neighbour not in self._images:
+                    self._pool.submit(self._warm, neighbour)
+        return image
+
+    __getitem__ = get
+
+    def prerender(self, workers=RENDER_WORKERS, progress=None):
+        """Renders every page missing from the disk cache across a process pool.
+
+        progress, if given, is called as progress(done, total) as page ranges finish.
+        """
+        missing = [page for page in range(self.page_count) if not os.path.exists(self._path(page))]
+        total, done = len(missing), 0
+        if progress:
+            progress(done, total)
+        if not missing:
+            return
+        ranges = [missing[i:i + PAGES_PER_TASK] for i in range(0, total, PAGES_PER_TASK)]
+        with pdf_pool(self.pdf_bytes, max(1, min(workers, len(ranges)))) as pool:
+            futures = [pool.submit(_render_range, pages, self.width, self.page_dir) for pages in ranges]
+            for future in as_completed(futures):
+                done += future.result()
+                if progress:
+                    progress(done, total)
+
+    def encoded(self, page, fmt=PAGE_FORMAT, quality=PAGE_QUALITY):
+        """Returns the page encoded as PNG/WEBP/JPEG bytes, cached on disk beside the PNG."""
+        if fmt == "PNG":
+            path = self._path(page)
+            if not os.path.exists(path):
+                self.get(page)
+        else:
+            path = os.path.join(self.page_dir, f"{page}.q{quality}.{fmt.lower()}")
+            if not os.path.exists(path):
+                buf = BytesIO()
+                self.get(page).save(buf, format=fmt, quality=quality)
+                write_atomic(path, buf.getvalue())
+        with open(path, "rb") as f:
+            return f.read()
+
+    def data_uri(self, page, fmt=PAGE_FORMAT, quality=PAGE_QUALITY):
+        """Returns the encoded page as a base64 data URI for embedding in HTML.
+
+        URIs are kept in a process-wide LRU keyed by (document hash, page,
+        width, format, quality), so reruns and other sessions on the same
+        document neither re-encode nor re-read the page.
+        """
+        key = (self.doc_hash, page, self.width, fmt, quality)
+        with _encoded_lock:
+            uri = _encoded.get(key)
+            if uri is not None:
+                _encoded.move_to_end(key)
+                return uri
+
+        data = self.encoded(page, fmt, quality)
+        uri = f"data:{_MIME[fmt]};base64,{base64.b64encode(data).decode()}"
+        with _encoded_lock:
+            _encoded[key] = uri
+            while len(_encoded) > ENCODED_PAGES:
+                _encoded.popitem(last=False)
+        return uri
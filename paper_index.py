@@ -0,0 +1,117 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+from contextlib import contextmanager
+from docstore import data_path, load_structured_data
+from text_index import tokenize
+
+INDEX_PATH = os.getenv("CONFER_SEARCH_INDEX", "output/search_index.sqlite")
+TITLE_TAGS = ("//Document/Title", "//Document/H1")
+
+
+def _title(elements):
+    for el in elements:
+        if el.get("Path", "").startswith(TITLE_TAGS) and el.get("Text", "").strip():
+            return el["Text"].strip()[:200]
+    return None
+
+
+class PaperIndex:
+    """SQLite FTS5 full-text index over the elements of every extracted paper.
+
+    Papers are indexed one at a time as their extraction finishes, keyed by
+    content hash and the version (mtime) of structuredData.json, so adding or
+    re-extracting a paper only rewrites that paper's rows. Each row keeps the
+    element's index, page and Bounds so a hit can open the viewer on it.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS papers ("
+                " doc_hash TEXT PRIMARY KEY,"
+                " version REAL NOT NULL,"
+                " title TEXT,"
+                " indexed REAL NOT NULL)"
+            )
+            db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS elements USING fts5("
+                " text, doc_hash UNINDEXED, idx UNINDEXED, page UNINDEXED, bounds UNINDEXED)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def add(self, doc_hash, outdir):
+        """Indexes a paper's current structuredData.json unless that version is already indexed."""
+        source = data_path(outdir)
+        if source is None:
+            return False
+        version = os.path.getmtime(source)
+        with self._connect() as db:
+            row = db.execute("SELECT version FROM papers WHERE doc_hash = ?", (doc_hash,)).fetchone()
+            if row is not None and row[0] == version:
+                return False
+        elements = (load_structured_data(outdir) or {}).get("elements", [])
+        rows = [
+            (el["Text"], doc_hash, i, el.get("Page"), json.dumps(el["Bounds"]) if "Bounds" in el else None)
+            for i, el in enumerate(elements) if el.get("Text", "").strip()
+        ]
+        with self._connect() as db:
+            db.execute("DELETE FROM elements WHERE doc_hash = ?", (doc_hash,))
+            db.executemany("INSERT INTO elements (text, doc_hash, idx, page, bounds) VALUES (?, ?, ?, ?, ?)", rows)
+            db.execute(
+                "INSERT OR REPLACE INTO papers (doc_hash, version, title, indexed) VALUES (?, ?, ?, ?)",
+                (doc_hash, version, _title(elements), time.time())
+            )
+        return True
+
+    def sync(self, root):
+        """Indexes every extracted paper under root that is new or has changed since it was indexed."""
+        try:
+            names = os.listdir(root)
+        except OSError:
+            return
+        for doc_hash in names:
+            outdir = os.path.join(root, doc_hash)
+            if os.path.isdir(outdir):
+                try:
+                    self.add(doc_hash, outdir)
+                except Exception:
+                    logging.exception(f"Indexing failed for {doc_hash}")
+
+    def search(self, query, limit=20):
+        """Returns the best matching elements across papers, the last word matching as a prefix."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = " ".join(f'"{t}"' for t in tokens) + "*"
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT e.doc_hash, e.idx, e.page, e.bounds, snippet(elements, 0, '**', '**', '…', 12), p.title"
+                " FROM elements e JOIN papers p ON p.doc_hash = e.doc_hash"
+                " WHERE elements MATCH ? ORDER BY bm25(elements) LIMIT ?",
+                (match, limit)
+            ).fetchall()
+        return [
+            {
+                "doc_hash": doc_hash,
+                "idx": idx,
+                "page": page,
+                "bounds": json.loads(bounds) if bounds else None,
+                "snippet": snippet,
+                "title": title
+            }
+            for doc_hash, idx, page, bounds, snippet, title in rows
+        ]
@@ -0,0 +1,31 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import fitz
+
+_worker_doc = None
+
+
+def _init_worker(pdf_bytes):
+    # Each worker receives the PDF once and keeps it open for all its page ranges.
+    global _worker_doc
+    _worker_doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+
+
+def worker_doc():
+    """Returns the fitz document opened by this worker process."""
+    return _worker_doc
+
+
+def pdf_pool(pdf_bytes, workers):
+    """Returns a process pool whose workers each open pdf_bytes once.
+
+    Workers are spawned rather than forked: the Streamlit server is
+    multi-threaded, and a fork can copy locks held mid-call by prefetch,
+    extraction or SQLite threads.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(pdf_bytes,)
+    )
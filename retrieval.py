@@ -0,0 +1,124 @@
+import os
+import re
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+from chunker import chunk_elements
+
+EMBEDDINGS = os.getenv("CONFER_EMBEDDINGS", "local")
+CHUNK_TOKENS = 300
+CHUNK_OVERLAP = 50
+TOP_K = 5
+
+_TOKENS = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """Offline embedding backend: hashed unigram and bigram counts, L2-normalized."""
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _bucket(self, feature):
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") % self.dim
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _TOKENS.findall(text.lower())
+            for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                vectors[row, self._bucket(feature)] += 1.0
+        return vectors
+
+
+class OpenAIEmbedder:
+    """Embedding backend using the OpenAI embeddings endpoint."""
+
+    def __init__(self, client, model="text-embedding-3-small", batch_size=256):
+        self.client = client
+        self.model = model
+        self.batch_size = batch_size
+        self.name = f"openai-{model}"
+
+    def embed(self, texts):
+        rows = []
+        for start in range(0, len(texts), self.batch_size):
+            response = self.client.embeddings.create(model=self.model, input=texts[start:start + self.batch_size])
+            rows.extend(item.embedding for item in response.data)
+        return np.array(rows, dtype=np.float32).reshape(len(texts), -1)
+
+
+def get_embedder(client=None):
+    if EMBEDDINGS == "openai":
+        return OpenAIEmbedder(client)
+    return HashingEmbedder()
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _version(index_dir):
+    try:
+        with open(os.path.join(index_dir, "chunks.json")) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data.get("version") if isinstance(data, dict) else None
+
+
+class RetrievalIndex:
+    """Brute-force cosine index over structure-aware chunks of one document.
+
+    Built once per document and embedder, and persisted under
+    `<outdir>/retrieval/<embedder name>/` together with the structuredData
+    version the chunks were cut from.
+    """
+
+    def __init__(self, chunks, vectors, embedder):
+        self.chunks = chunks
+        self.vectors = vectors
+        self.embedder = embedder
+
+    @classmethod
+    def load(cls, outdir, elements, embedder, version):
+        index_dir = os.path.join(outdir, "retrieval", embedder.name)
+        if _version(index_dir) != version:
+            chunks = chunk_elements(elements, max_tokens=CHUNK_TOKENS, overlap_tokens=CHUNK_OVERLAP)
+            vectors = _normalize(embedder.embed([c["text"] for c in chunks])) if chunks else np.zeros((0, 1), dtype=np.float32)
+
+            os.makedirs(os.path.dirname(index_dir), exist_ok=True)
+            work = tempfile.mkdtemp(prefix=".retrieval-", dir=os.path.dirname(index_dir))
+            np.save(os.path.join(work, "vectors.npy"), vectors.astype(np.float32))
+            with open(os.path.join(work, "chunks.json"), "w") as f:
+                json.dump({"version": version, "chunks": chunks}, f)
+            # An index built from another version of structuredData.json is replaced.
+            if os.path.isdir(index_dir) and _version(index_dir) != version:
+                shutil.rmtree(index_dir, ignore_errors=True)
+            try:
+                os.rename(work, index_dir)
+            except OSError:
+                shutil.rmtree(work, ignore_errors=True)
+            return cls(chunks, vectors, embedder)
+
+        vectors = np.load(os.path.join(index_dir, "vectors.npy"))
+        with open(os.path.join(index_dir, "chunks.json")) as f:
+            chunks = json.load(f)["chunks"]
+        return cls(chunks, vectors, embedder)
+
+    def search(self, query, k=TOP_K):
+        """Returns the top-k chunks for the query, each with a cosine `score`."""
+        if not self.chunks or not query.strip():
+            return []
+        q = _normalize(self.embedder.embed([query]))[0]
+        scores = self.vectors @ q
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [{**self.chunks[i], "score": float(scores[i])} for i in top]
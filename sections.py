@@ -0,0 +1,137 @@
+import os
+import json
+import bisect
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from chunker import path_tag, chunk_text, count_tokens
+from docstore import data_version, write_atomic
+from llm import summarize_batch
+
+SECTION_TAGS = ("Title", "H1", "H2")
+SECTION_MAX_TOKENS = 1500
+SECTIONS_NAME = "sections.json"
+
+
+def group_sections(elements, max_tokens=SECTION_MAX_TOKENS):
+    """Splits elements into sections that start at each Title/H1/H2 element.
+
+    Returns dicts with the inclusive [start, end] element range, the heading
+    text as title and the page the section starts on. Sections longer than
+    max_tokens are cut at element boundaries into consecutive parts that
+    share the title and carry a 1-based `part` number.
+    """
+    sections = []
+    for i, el in enumerate(elements):
+        heading = path_tag(el.get("Path", "")) in SECTION_TAGS
+        if heading or not sections:
+            if sections:
+                sections[-1]["end"] = i - 1
+            sections.append({
+                "start": i,
+                "end": i,
+                "title": el.get("Text", "").strip() if heading else "",
+                "page": el.get("Page")
+            })
+    if sections:
+        sections[-1]["end"] = len(elements) - 1
+    return [part for section in sections for part in _split(elements, section, max_tokens)]
+
+
+def _split(elements, section, max_tokens):
+    parts, start, size = [], section["start"], 0
+    for i in range(section["start"], section["end"] + 1):
+        tokens = count_tokens(elements[i].get("Text", ""))
+        if size and size + tokens > max_tokens:
+            parts.append({**section, "start": start, "end": i - 1, "page": elements[start].get("Page")})
+            start, size = i, 0
+        size += tokens
+    parts.append({**section, "start": start, "end": section["end"], "page": elements[start].get("Page")})
+    if len(parts) > 1:
+        for n, part in enumerate(parts, 1):
+            part["part"] = n
+    return parts
+
+
+def section_text(elements, section):
+    # Sections are split to fit SECTION_MAX_TOKENS; only a single oversized element is cut here.
+    text = "\n".join(
+        elements[i].get("Text", "").strip() for i in range(section["start"], section["end"] + 1)
+    ).strip()
+    return chunk_text(text, SECTION_MAX_TOKENS)[0] if text else ""
+
+
+def find_section(sections, idx):
+    """Returns the section containing element idx, or None."""
+    pos = bisect.bisect_right([s["start"] for s in sections], idx) - 1
+    if pos >= 0 and sections[pos]["start"] <= idx <= sections[pos]["end"]:
+        return sections[pos]
+    return None
+
+
+class SectionSummaries:
+    """Pre-generates section summaries in the background after extraction.
+
+    Results are stored as sections.json in the document's hash directory,
+    keyed by element range and tagged with the structuredData version they
+    were computed from, so every session on the paper reads them back and a
+    re-extraction (progressive mode) never shows ranges from the old one.
+    """
+
+    def __init__(self, client, workers=1):
+        self.client = client
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.running = set()
+        self.lock = threading.Lock()
+
+    def path(self, outdir):
+        return os.path.join(outdir, SECTIONS_NAME)
+
+    def _read(self, outdir, version):
+        try:
+            with open(self.path(outdir)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data["sections"] if isinstance(data, dict) and data.get("version") == version else None
+
+    def load(self, outdir, version):
+        """Returns the sections computed for this version, or None while they are being generated."""
+        return self._read(outdir, version)
+
+    def pending(self, outdir):
+        return any(key[0] == outdir for key in self.running)
+
+    def submit(self, outdir, elements, version):
+        key = (outdir, version)
+        with self.lock:
+            if key in self.running or self._read(outdir, version) is not None:
+                return
+            self.running.add(key)
+        self.pool.submit(self._run, outdir, elements, version)
+
+    def _run(self, outdir, elements, version):
+        try:
+            sections = group_sections(elements)
+            items = []
+            for n, section in enumerate(sections):
+                text = section_text(elements, section)
+                if text:
+                    items.append((f"s{n}", text))
+            summaries = summarize_batch(
+                self.client,
+                items,
+                "You are a helpful assistant that summarizes sections of research papers in 2-3 sentences."
+            )
+            for n, section in enumerate(sections):
+                section["summary"] = summaries.get(f"s{n}", "")
+            if data_version(outdir) != version:
+                logging.info(f"Dropping section summaries for a replaced extraction of {outdir}")
+                return
+            payload = {"version": version, "sections": sections}
+            write_atomic(self.path(outdir), json.dumps(payload).encode("utf-8"))
+        except Exception:
+            logging.exception(f"Section summarization failed for {outdir}")
+        finally:
+            with self.lock:
+                self.running.discard((outdir, version))
@@ -0,0 +1,120 @@
+import os
+import csv
+import io
+import json
+import logging
+import threading
+from docstore import load_structured_data, write_atomic
+
+TABLES_NAME = "tables.json"
+MAX_TABLE_CHARS = 6000
+
+
+def _convert(xlsx_path):
+    """Reads the first sheet of an xlsx rendition into rows of strings.
+
+    Cells are unescaped from OOXML `_xHHHH_` sequences (the renditions end
+    most cells with `_x000D_`) and whitespace is collapsed.
+    """
+    from openpyxl import load_workbook
+    from openpyxl.utils.escape import unescape
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        rows = [
+            ["" if v is None else " ".join(unescape(str(v)).split()) for v in row]
+            for row in wb.worksheets[0].iter_rows(values_only=True)
+        ]
+    finally:
+        wb.close()
+    return [row for row in rows if any(row)]
+
+
+def serialize_table(rows, max_chars=MAX_TABLE_CHARS):
+    """Pipe-separated rows, cut at a row boundary once max_chars is reached."""
+    lines, size = [], 0
+    for row in rows:
+        line = " | ".join(cell.replace("\n", " ") for cell in row)
+        if lines and size + len(line) > max_chars:
+            lines.append("…")
+            break
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+class TableStore:
+    """The tables of one extraction, linked to their `Table` elements.
+
+    The element -> rendition links are read from structuredData.json once and
+    kept in `<outdir>/tables.json`, tagged with the structuredData version
+    they were read from. Each xlsx rendition is converted to a CSV
+    beside it the first time it is opened, so later loads only parse the CSV.
+    """
+
+    def __init__(self, outdir, version):
+        self.outdir = outdir
+        self.rows = {}
+        self.lock = threading.Lock()
+        self.entries = self._read(version)
+        if self.entries is None:
+            self.entries = self._scan()
+            payload = {"version": version, "entries": self.entries}
+            write_atomic(os.path.join(outdir, TABLES_NAME), json.dumps(payload).encode("utf-8"))
+        self.by_path = {e["path"]: idx for idx, e in self.entries.items()}
+
+    def _read(self, version):
+        try:
+            with open(os.path.join(self.outdir, TABLES_NAME)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != version:
+            return None
+        return {int(k): v for k, v in data["entries"].items()}
+
+    def _scan(self):
+        entries = {}
+        data = load_structured_data(self.outdir) or {}
+        for i, el in enumerate(data.get("elements", [])):
+            xlsx = [p for p in el.get("filePaths", []) if p.endswith(".xlsx")]
+            if xlsx:
+                entries[i] = {"path": el.get("Path", ""), "xlsx": xlsx[0], "page": el.get("Page")}
+        return entries
+
+    def table_for(self, idx, path):
+        """Returns the table element index for a table or one of its cells, else None.
+
+        A cell belongs to the table whose `Path` is a prefix of its own, at any
+        depth (tables may be nested in sections or lists).
+        """
+        if idx in self.entries:
+            return idx
+        path = path or ""
+        while "/" in path.strip("/"):
+            path = path.rsplit("/", 1)[0]
+            if path in self.by_path:
+                return self.by_path[path]
+        return None
+
+    def load(self, idx):
+        """Returns the table's rows, converting its xlsx rendition on first use."""
+        with self.lock:
+            if idx in self.rows:
+                return self.rows[idx]
+        xlsx = os.path.join(self.outdir, self.entries[idx]["xlsx"])
+        csv_path = os.path.splitext(xlsx)[0] + ".csv"
+        if os.path.exists(csv_path):
+            with open(csv_path, newline="", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+        else:
+            try:
+                rows = _convert(xlsx)
+            except Exception:
+                logging.exception(f"Could not read table rendition {xlsx}")
+                return None
+            buf = io.StringIO()
+            csv.writer(buf).writerows(rows)
+            write_atomic(csv_path, buf.getvalue().encode("utf-8"))
+        with self.lock:
+            self.rows[idx] = rows
+        return rows
@@ -0,0 +1,28 @@
+import os
+import shutil
+import pytest
+from docstore import load_structured_data
+
+FIXTURE_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output", "ExtractTextInfoFromPDF")
+DORA = "b6757cfb5a48db326e318674084f7ee7"
+TRANSFORMER = "55797512d487a59fa7a171332fb451a8"
+
+
+@pytest.fixture
+def paper_dir(tmp_path):
+    """Returns a function copying a bundled extraction into a scratch hash directory."""
+    def copy(doc_hash):
+        outdir = tmp_path / doc_hash
+        shutil.copytree(os.path.join(FIXTURE_ROOT, doc_hash), outdir)
+        return str(outdir)
+    return copy
+
+
+@pytest.fixture(scope="session")
+def dora_elements():
+    return load_structured_data(os.path.join(FIXTURE_ROOT, DORA))["elements"]
+
+
+@pytest.fixture(scope="session")
+def transformer_elements():
+    return load_structured_data(os.path.join(FIXTURE_ROOT, TRANSFORMER))["elements"]
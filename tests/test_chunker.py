@@ -0,0 +1,42 @@
+from chunker import count_tokens, chunk_text, chunk_elements, path_tag, path_block
+
+
+def test_path_helpers():
+    assert path_tag("//Document/H2[3]") == "H2"
+    assert path_block("//Document/Table[2]/TR/TD/P") == "Table[2]"
+    assert path_tag("") == ""
+
+
+def test_chunk_text_respects_budget_and_keeps_every_word():
+    text = " ".join(f"word{i}" for i in range(500))
+    chunks = chunk_text(text, 50)
+    assert all(count_tokens(c) <= 50 for c in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_chunk_text_overlap_repeats_the_tail():
+    chunks = chunk_text(" ".join(f"w{i}" for i in range(100)), 20, overlap_tokens=5)
+    assert len(chunks) > 1
+    assert chunks[0].split()[-1] in chunks[1].split()
+
+
+def test_chunk_elements_covers_text_elements_in_order(transformer_elements):
+    chunks = chunk_elements(transformer_elements, max_tokens=300)
+    assert all(c["tokens"] <= 300 for c in chunks)
+    starts = [c["start"] for c in chunks]
+    assert starts == sorted(starts)
+    covered = set()
+    for c in chunks:
+        covered.update(range(c["start"], c["end"] + 1))
+    text_ids = {i for i, el in enumerate(transformer_elements) if el.get("Text", "").strip()}
+    assert text_ids <= covered
+
+
+def test_chunk_elements_cuts_before_headings(transformer_elements):
+    chunks = chunk_elements(transformer_elements, max_tokens=2000)
+    starts = {c["start"] for c in chunks}
+    headings = [
+        i for i, el in enumerate(transformer_elements)
+        if path_tag(el.get("Path", "")) in ("H1", "H2") and el.get("Text", "").strip()
+    ]
+    assert headings and all(i in starts for i in headings[1:])
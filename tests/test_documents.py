@@ -0,0 +1,50 @@
+import gc
+import os
+import threading
+from documents import DocumentRegistry
+
+PDF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "extractPdfInput.pdf")
+
+
+def pdf_bytes():
+    with open(PDF, "rb") as f:
+        return f.read()
+
+
+def test_concurrent_sessions_share_one_document(tmp_path):
+    registry, data, handles = DocumentRegistry(), pdf_bytes(), []
+    threads = [
+        threading.Thread(target=lambda: handles.append(registry.acquire("a", str(tmp_path / "a"), data)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(h.document) for h in handles}) == 1
+    assert registry.refs["a"] == 4
+
+
+def test_release_never_takes_the_lock(tmp_path):
+    registry = DocumentRegistry()
+    handle = registry.acquire("a", str(tmp_path / "a"), pdf_bytes())
+    with registry.lock:
+        # As when the cyclic GC finalizes a handle on a thread inside acquire().
+        del handle
+        gc.collect()
+    assert list(registry.released) == ["a"]
+    b = registry.acquire("b", str(tmp_path / "b"), pdf_bytes())
+    assert registry.refs == {"a": 0, "b": 1} and not registry.released
+    assert b.document.doc_hash == "b"
+
+
+def test_unreferenced_documents_are_evicted_over_budget(tmp_path):
+    registry = DocumentRegistry(max_bytes=0)
+    a = registry.acquire("a", str(tmp_path / "a"), pdf_bytes())
+    kept = a.document
+    del a
+    gc.collect()
+    b = registry.acquire("b", str(tmp_path / "b"), pdf_bytes())
+    assert "a" not in registry.docs and "b" in registry.docs
+    assert registry.acquire("a", str(tmp_path / "a"), pdf_bytes()).document is not kept
+    assert b.document.pages.page_count == 3
@@ -0,0 +1,28 @@
+import os
+import pytest
+from conftest import DORA
+from elements_store import ElementStore, COLUMNS_DIR
+
+
+def test_store_matches_structured_data(paper_dir, dora_elements):
+    outdir = paper_dir(DORA)
+    store = ElementStore.load(outdir)
+    assert os.path.isdir(os.path.join(outdir, COLUMNS_DIR))
+    assert len(store) == len(dora_elements)
+    for i in (0, 1, len(dora_elements) // 2, len(dora_elements) - 1):
+        el, original = store[i], dora_elements[i]
+        assert el["Path"] == original["Path"]
+        assert el.get("Page") == original.get("Page")
+        assert el.get("Text") == original.get("Text")
+        if "Bounds" in original:
+            assert el["Bounds"] == pytest.approx(original["Bounds"], abs=1e-2)
+    assert store[-1] == store[len(store) - 1]
+    with pytest.raises(IndexError):
+        store[len(store)]
+
+
+def test_reload_maps_the_cached_columns(paper_dir):
+    outdir = paper_dir(DORA)
+    first = ElementStore.load(outdir)
+    second = ElementStore.load(outdir)
+    assert [second.text(i) for i in range(50)] == [first.text(i) for i in range(50)]
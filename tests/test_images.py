@@ -0,0 +1,46 @@
+import io
+import os
+import threading
+import fitz
+from PIL import Image
+from images import ImageCatalog, CATALOG_NAME
+
+
+def pdf_with_shared_image():
+    """Three pages: one image drawn twice on page 0 and again on page 1."""
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 6), "red").save(buf, format="PNG")
+    doc = fitz.open()
+    page = doc.new_page()
+    xref = page.insert_image(fitz.Rect(10, 10, 50, 40), stream=buf.getvalue())
+    page.insert_image(fitz.Rect(100, 100, 140, 130), xref=xref)
+    doc.new_page().insert_image(fitz.Rect(20, 20, 60, 50), xref=xref)
+    doc.new_page()
+    return fitz.open(stream=doc.tobytes(), filetype="pdf"), xref
+
+
+def test_images_are_deduplicated_by_xref(tmp_path):
+    doc, xref = pdf_with_shared_image()
+    catalog = ImageCatalog(doc, threading.Lock(), str(tmp_path))
+    assert not os.path.exists(tmp_path / "images")
+    assert list(catalog.entries) == [xref]
+    entry = catalog.entries[xref]
+    assert (entry["width"], entry["height"], entry["pages"]) == (8, 6, [0, 1])
+    assert entry["bboxes"] == [[10.0, 10.0, 50.0, 40.0], [20.0, 20.0, 60.0, 50.0]]
+    assert catalog.on_page(1) == [entry] and catalog.on_page(2) == []
+
+
+def test_catalog_round_trips_through_disk(tmp_path):
+    doc, xref = pdf_with_shared_image()
+    first = ImageCatalog(doc, threading.Lock(), str(tmp_path)).entries
+    assert os.path.exists(tmp_path / "images" / CATALOG_NAME)
+    # A second catalog reads the file instead of walking the pages.
+    assert ImageCatalog(None, None, str(tmp_path)).entries == first
+
+
+def test_image_bytes_are_extracted_once(tmp_path):
+    doc, xref = pdf_with_shared_image()
+    data, ext = ImageCatalog(doc, threading.Lock(), str(tmp_path)).load(xref)
+    assert ext == "png" and Image.open(io.BytesIO(data)).size == (8, 6)
+    assert os.path.exists(tmp_path / "images" / f"{xref}.png")
+    assert ImageCatalog(None, None, str(tmp_path)).load(xref) == (data, ext)
@@ -0,0 +1,24 @@
+from jargon import extract_terms, load_common_words, _expansion, JargonIndex
+
+
+def test_expansion_matches_initials_in_order():
+    assert _expansion("we propose Weight-Decomposed Low-Rank Adaptation".split(), "DoRA") == \
+        "Weight-Decomposed Low-Rank Adaptation"
+    assert _expansion("known as Low-Rank Adaptation".split(), "LoRA") == "Low-Rank Adaptation"
+    assert _expansion("called parameter-efficient fine-tuning".split(), "PEFT") == "parameter-efficient fine-tuning"
+    assert _expansion("an unrelated phrase".split(), "XYZ") is None
+
+
+def test_terms_from_the_dora_paper(dora_elements):
+    terms = extract_terms(dora_elements, load_common_words())
+    assert terms["DoRA"]["expansion"] == "Weight-Decomposed Low-Rank Adaptation"
+    assert terms["LoRA"]["expansion"] == "Low-Rank Adaptation"
+    lowered = [t.lower() for t in terms]
+    assert len(lowered) == len(set(lowered))
+    for noise in ("https", "arxiv", "conference", "proceedings", "google", "learning"):
+        assert noise not in lowered
+
+    index = JargonIndex(terms)
+    first = terms["DoRA"]["occurrences"][0]
+    assert "DoRA" in index.terms_in(first)
+    assert "DoRA" in dora_elements[first]["Text"]
@@ -0,0 +1,65 @@
+import json
+import os
+import time
+from docstore import write_structured_data
+from jobs import ExtractionJobs
+
+
+def wait(jobs, doc_hash, timeout=5):
+    deadline = time.time() + timeout
+    while doc_hash in jobs.running and time.time() < deadline:
+        time.sleep(0.01)
+    return jobs.status(doc_hash)
+
+
+def stage(elements):
+    def run(pdf_bytes, outdir):
+        write_structured_data(outdir, {"elements": elements})
+    return run
+
+
+def test_job_runs_once_and_notifies(tmp_path):
+    calls, seen = [], []
+
+    def counting(pdf_bytes, outdir):
+        calls.append(pdf_bytes)
+        stage([{"Text": "hello", "Page": 0}])(pdf_bytes, outdir)
+
+    jobs = ExtractionJobs(stages=[counting], root=str(tmp_path), listeners=[lambda h, d: seen.append(h)])
+    jobs.submit("abc", b"%PDF")
+    jobs.submit("abc", b"%PDF")
+    assert wait(jobs, "abc")["state"] == "done"
+    assert calls == [b"%PDF"] and seen == ["abc"]
+    assert jobs.result("abc")["elements"][0]["Text"] == "hello"
+    assert jobs.submit("abc", b"%PDF")["state"] == "done"
+    assert len(calls) == 1
+
+
+def test_failed_stage_is_reported(tmp_path):
+    def broken(pdf_bytes, outdir):
+        raise RuntimeError("boom")
+
+    jobs = ExtractionJobs(stages=[broken], root=str(tmp_path))
+    jobs.submit("bad", b"")
+    status = wait(jobs, "bad")
+    assert status["state"] == "failed" and "boom" in status["error"]
+
+
+def test_refining_stage_replaces_data_and_invalidates_derived(tmp_path):
+    seen = []
+
+    def refine(pdf_bytes, outdir):
+        time.sleep(0.05)  # a new mtime for the replaced file
+        stage([{"Text": "refined", "Page": 0}])(pdf_bytes, outdir)
+
+    def first(pdf_bytes, outdir):
+        stage([{"Text": "draft", "Page": 0}])(pdf_bytes, outdir)
+        with open(os.path.join(outdir, "sections.json"), "w") as f:
+            json.dump({"version": 0, "sections": []}, f)
+
+    jobs = ExtractionJobs(stages=[first, refine], root=str(tmp_path), listeners=[lambda h, d: seen.append(h)])
+    jobs.submit("p", b"")
+    assert wait(jobs, "p")["state"] == "done"
+    assert jobs.result("p")["elements"][0]["Text"] == "refined"
+    assert not os.path.exists(os.path.join(jobs.outdir("p"), "sections.json"))
+    assert seen == ["p", "p"]
@@ -0,0 +1,187 @@
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from openai import RateLimitError
+import llm
+from llm_cache import LLMCache
+
+
+class FakeClient:
+    """Stands in for OpenAI(): chat.completions.create answers with reply(kwargs)."""
+
+    def __init__(self, reply, delay=0.0):
+        self.reply = reply
+        self.delay = delay
+        self.calls = []
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def with_options(self, **options):
+        self.options = options
+        return self
+
+    def create(self, **kwargs):
+        with self.lock:
+            self.calls.append(kwargs)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            content = self.reply(kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+        if kwargs.get("stream"):
+            return iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=d))]) for d in content])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def rate_limited(retry_after):
+    response = SimpleNamespace(request=None, status_code=429, headers={"retry-after": retry_after})
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+def prompt(kwargs):
+    return kwargs["messages"][-1]["content"]
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = LLMCache(str(tmp_path / "llm_cache.sqlite"))
+    monkeypatch.setattr(llm, "_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waits = []
+    monkeypatch.setattr(llm.time, "sleep", waits.append)
+    return waits
+
+
+def test_map_calls_are_bounded_by_concurrency():
+    client = FakeClient(lambda kw: "summary", delay=0.05)
+    result = llm.map_reduce_summary(client, [f"chunk {i}" for i in range(20)], concurrency=4)
+    assert result == "summary"
+    assert client.peak == 4
+    assert len(client.calls) == 21
+
+
+def test_reduce_combines_in_rounds_until_one_request_fits():
+    def reply(kwargs):
+        kind = "c" if prompt(kwargs).startswith("Combine") else "s"
+        return f"{kind}{len(client.calls):03d}".ljust(100, kind)
+
+    client = FakeClient(reply)
+    llm.map_reduce_summary(client, [f"chunk {i}" for i in range(16)], reduce_max_chars=350)
+    combines = [prompt(kw) for kw in client.calls if prompt(kw).startswith("Combine")]
+    # 16 summaries -> 6 groups -> 2 groups -> final combine.
+    assert len(combines) == 6 + 2 + 1
+    final = combines[-1].split("\n\n", 1)[1]
+    assert len(final) <= 350
+
+
+def test_single_summary_is_still_combined_once():
+    client = FakeClient(lambda kw: "x")
+    assert llm.map_reduce_summary(client, ["only"]) == "x"
+    assert len(client.calls) == 2
+    assert llm.map_reduce_summary(client, []) == ""
+
+
+def test_rate_limits_are_retried_after_the_suggested_wait(sleeps):
+    failures = [rate_limited("7"), rate_limited("not a number")]
+
+    def reply(kwargs):
+        if failures:
+            raise failures.pop(0)
+        return "done"
+
+    client = FakeClient(reply)
+    assert llm.complete(client, [{"role": "user", "content": "hi"}]) == "done"
+    assert sleeps[0] == 7.0
+    assert 2.0 <= sleeps[1] <= 4.0
+
+
+def test_retries_are_bounded(sleeps):
+    def reply(kwargs):
+        raise rate_limited("1")
+
+    client = FakeClient(reply)
+    with pytest.raises(RateLimitError):
+        llm.complete(client, [{"role": "user", "content": "hi"}], retries=2)
+    assert len(client.calls) == 3
+    assert sleeps == [1.0, 1.0]
+    assert client.options == {"max_retries": 0}
+
+
+def test_answers_are_served_from_the_cache(cache):
+    client = FakeClient(lambda kw: " answer ")
+    messages = [{"role": "user", "content": "hi"}]
+    assert llm.complete(client, messages) == "answer"
+    assert llm.complete(client, messages) == "answer"
+    assert len(client.calls) == 1
+
+
+def test_stream_is_cached_only_once_fully_consumed(cache):
+    client = FakeClient(lambda kw: ["Hello", None, " world", ""])
+    messages = [{"role": "user", "content": "hi"}]
+    key = llm.cache_key(llm.MODEL, messages, 0.3, 500)
+
+    partial = llm.stream_complete(client, messages)
+    assert next(partial) == "Hello"
+    partial.close()
+    assert cache.get(key) is None
+
+    assert list(llm.stream_complete(client, messages)) == ["Hello", " world"]
+    assert cache.get(key) == "Hello world"
+    assert list(llm.stream_complete(client, messages)) == ["Hello world"]
+    assert len(client.calls) == 2
+    assert client.calls[0]["stream"] is True
+
+
+def batch_ids(kwargs):
+    return re.findall(r"^### (\S+)$", prompt(kwargs), re.M)
+
+
+def test_batch_maps_json_keys_back_to_int_ids():
+    client = FakeClient(lambda kw: json.dumps({i: f"summary of {i}" for i in batch_ids(kw)} | {"extra": "x"}))
+    result = llm.summarize_batch(client, [(1, "one"), (2, "two"), (3, "three")], "Be brief.")
+    assert result == {1: "summary of 1", 2: "summary of 2", 3: "summary of 3"}
+    assert len(client.calls) == 1
+    assert client.calls[0]["response_format"] == {"type": "json_object"}
+
+
+def test_batch_retries_missing_items_one_per_request():
+    def reply(kwargs):
+        ids = batch_ids(kwargs)
+        if len(ids) > 1:
+            return json.dumps({i: f"s{i}" for i in ids if i != "b"})
+        return json.dumps({ids[0]: f"alone {ids[0]}"})
+
+    client = FakeClient(reply)
+    result = llm.summarize_batch(client, [("a", "x"), ("b", "y"), ("c", "z")], "Be brief.")
+    assert result == {"a": "sa", "b": "alone b", "c": "sc"}
+    assert [batch_ids(kw) for kw in client.calls] == [["a", "b", "c"], ["b"]]
+
+
+def test_batch_with_invalid_json_falls_back_to_single_items():
+    def reply(kwargs):
+        ids = batch_ids(kwargs)
+        return "not json" if len(ids) > 1 else json.dumps({ids[0]: "ok"})
+
+    client = FakeClient(reply)
+    assert llm.summarize_batch(client, [(1, "x"), (2, "y")], "Be brief.") == {1: "ok", 2: "ok"}
+
+
+def test_batches_are_packed_by_token_budget():
+    client = FakeClient(lambda kw: json.dumps({i: i for i in batch_ids(kw)}))
+    items = [(i, "word " * 300) for i in range(6)]
+    result = llm.summarize_batch(client, items, "Be brief.", max_input_tokens=700)
+    assert result == {i: str(i) for i in range(6)}
+    assert all(len(batch_ids(kw)) <= 2 for kw in client.calls)
+    assert len(client.calls) < len(items)
@@ -0,0 +1,30 @@
+import time
+from llm_cache import LLMCache, cache_key
+
+
+def test_cache_key_depends_on_every_parameter():
+    messages = [{"role": "user", "content": "hi"}]
+    key = cache_key("m", messages, 0.3, 100)
+    assert key == cache_key("m", messages, 0.3, 100)
+    assert key != cache_key("m", messages, 0.4, 100)
+    assert key != cache_key("m", messages, 0.3, 100, json_mode=True)
+
+
+def test_round_trip_and_ttl(tmp_path):
+    cache = LLMCache(str(tmp_path / "c.sqlite"), ttl=0.2)
+    cache.put("k", "value")
+    assert cache.get("k") == "value"
+    assert cache.get("missing") is None
+    time.sleep(0.3)
+    assert cache.get("k") is None
+
+
+def test_evicts_least_recently_used_past_max_bytes(tmp_path):
+    cache = LLMCache(str(tmp_path / "c.sqlite"), ttl=0, max_bytes=25)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    assert cache.get("a") is not None
+    cache.put("c", "z" * 10)
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 10
+    assert cache.get("c") == "z" * 10
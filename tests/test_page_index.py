@@ -0,0 +1,21 @@
+import pytest
+from page_index import PageIndex
+
+
+def test_groups_elements_by_page_and_scales_rects():
+    elements = [
+        {"Page": 0, "Bounds": [10, 700, 110, 750], "Text": "a"},
+        {"Page": 1, "Bounds": [0, 0, 612, 792]},
+        {"Text": "no bounds"},
+        {"Page": 0, "Bounds": [50, 100, 60, 120]},
+    ]
+    index = PageIndex(elements, [(612, 792), (612, 792)])
+    assert index.elements_on(0) == [0, 3]
+    assert index.elements_on(1) == [1]
+    assert index.elements_on(5) == []
+
+    layout = index.layout(0, 2.0, 2.0)
+    i, x, y, w, h = layout.rects[0]
+    assert (i, x, y, w, h) == (0, 20.0, (792 - 750) * 2.0, 200.0, 100.0)
+    assert index.layout(0, 2.0, 2.0) is layout
+    assert layout.payload()[1] == [3, 100.0, pytest.approx((792 - 120) * 2.0), 20.0, 40.0]
@@ -0,0 +1,35 @@
+import os
+from conftest import DORA, TRANSFORMER
+from docstore import DATA_NAME
+from paper_index import PaperIndex
+
+
+def test_indexes_papers_incrementally(tmp_path, paper_dir):
+    index = PaperIndex(str(tmp_path / "search.sqlite"))
+    dora, transformer = paper_dir(DORA), paper_dir(TRANSFORMER)
+    assert index.add(DORA, dora)
+    assert index.add(TRANSFORMER, transformer)
+    assert not index.add(DORA, dora)
+
+    hits = index.search("multi-head attention")
+    assert hits and hits[0]["doc_hash"] == TRANSFORMER
+    hit = hits[0]
+    assert isinstance(hit["idx"], int) and hit["page"] is not None and len(hit["bounds"]) == 4
+    assert "**" in hit["snippet"]
+
+    # A new version of one paper replaces only that paper's rows.
+    path = os.path.join(dora, DATA_NAME)
+    before = len(index.search("dora", limit=1000))
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+    assert index.add(DORA, dora)
+    assert len(index.search("dora", limit=1000)) == before
+    assert index.search("multi-head attention")[0]["doc_hash"] == TRANSFORMER
+
+
+def test_sync_adds_every_extracted_paper(tmp_path, paper_dir):
+    paper_dir(DORA)
+    paper_dir(TRANSFORMER)
+    index = PaperIndex(str(tmp_path / "search.sqlite"))
+    index.sync(str(tmp_path))
+    assert {h["doc_hash"] for h in index.search("the", limit=2000)} == {DORA, TRANSFORMER}
+    assert index.search("") == []
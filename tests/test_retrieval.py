@@ -0,0 +1,27 @@
+from conftest import TRANSFORMER
+from docstore import data_version
+from elements_store import ElementStore
+from retrieval import HashingEmbedder, RetrievalIndex
+
+
+def test_local_embedder_retrieves_the_relevant_passage(paper_dir):
+    outdir = paper_dir(TRANSFORMER)
+    elements = ElementStore.load(outdir)
+    index = RetrievalIndex.load(outdir, elements, HashingEmbedder(), data_version(outdir))
+    hits = index.search("scaled dot-product attention softmax of queries and keys", k=3)
+    assert len(hits) == 3
+    assert hits[0]["score"] >= hits[-1]["score"]
+    assert any("dot-product" in h["text"].lower() for h in hits)
+    assert index.search("   ") == []
+    reloaded = RetrievalIndex.load(outdir, elements, HashingEmbedder(), data_version(outdir))
+    assert [h["start"] for h in reloaded.search("positional encoding", k=2)] == \
+        [h["start"] for h in index.search("positional encoding", k=2)]
+
+
+def test_index_from_another_version_is_rebuilt(paper_dir):
+    outdir = paper_dir(TRANSFORMER)
+    elements = ElementStore.load(outdir)
+    assert RetrievalIndex.load(outdir, [], HashingEmbedder(), -1.0).search("attention") == []
+    index = RetrievalIndex.load(outdir, elements, HashingEmbedder(), data_version(outdir))
+    assert index.search("attention")
+    assert RetrievalIndex.load(outdir, elements, HashingEmbedder(), data_version(outdir)).chunks == index.chunks
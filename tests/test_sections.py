@@ -0,0 +1,22 @@
+from chunker import count_tokens
+from sections import group_sections, section_text, find_section, SECTION_MAX_TOKENS
+
+
+def test_sections_cover_the_paper_within_the_budget(dora_elements):
+    sections = group_sections(dora_elements)
+    assert sections[0]["start"] == 0 and sections[-1]["end"] == len(dora_elements) - 1
+    assert all(a["end"] + 1 == b["start"] for a, b in zip(sections, sections[1:]))
+    for section in sections:
+        n = sum(count_tokens(dora_elements[i].get("Text", "")) for i in range(section["start"], section["end"] + 1))
+        assert n <= SECTION_MAX_TOKENS or section["start"] == section["end"]
+        assert count_tokens(section_text(dora_elements, section)) <= SECTION_MAX_TOKENS
+    parts = [s for s in sections if s.get("part")]
+    assert parts and all(s["title"] for s in parts)
+
+
+def test_find_section(dora_elements):
+    sections = group_sections(dora_elements)
+    for idx in (0, 100, len(dora_elements) - 1):
+        section = find_section(sections, idx)
+        assert section["start"] <= idx <= section["end"]
+    assert find_section([], 3) is None
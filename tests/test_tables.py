@@ -0,0 +1,50 @@
+import json
+import os
+from conftest import DORA
+from docstore import data_version, write_structured_data
+from tables import TableStore, TABLES_NAME, serialize_table
+
+
+def test_tables_are_linked_converted_once_and_clean(paper_dir, dora_elements):
+    outdir = paper_dir(DORA)
+    store = TableStore(outdir, data_version(outdir))
+    assert store.entries
+    idx = min(store.entries)
+    assert dora_elements[idx]["Path"].startswith("//Document/Table")
+
+    cell = next(i for i in range(idx + 1, len(dora_elements)) if dora_elements[i]["Path"].startswith("//Document/Table/"))
+    assert store.table_for(cell, dora_elements[cell]["Path"]) == idx
+    assert store.table_for(0, dora_elements[0]["Path"]) is None
+
+    rows = store.load(idx)
+    assert rows and rows[0][0] == "Model"
+    assert not any("_x000D_" in c for row in rows for c in row)
+    csv_path = os.path.join(outdir, os.path.splitext(store.entries[idx]["xlsx"])[0] + ".csv")
+    assert os.path.exists(csv_path)
+    assert TableStore(outdir, data_version(outdir)).load(idx) == rows
+
+    text = serialize_table(rows, max_chars=200)
+    assert text.startswith("Model | ") and len(text) < 400
+
+
+def test_links_from_another_version_are_rescanned(paper_dir):
+    outdir = paper_dir(DORA)
+    with open(os.path.join(outdir, TABLES_NAME), "w") as f:
+        json.dump({"version": -1.0, "entries": {"0": {"path": "//Document/P", "xlsx": "tables/x.xlsx", "page": 0}}}, f)
+    store = TableStore(outdir, data_version(outdir))
+    assert 0 not in store.entries and store.entries
+
+
+def test_cells_are_linked_to_nested_tables_by_path(tmp_path):
+    elements = [
+        {"Path": "//Document/Sect/H1", "Text": "Results"},
+        {"Path": "//Document/Sect/Table", "filePaths": ["tables/fileoutpart0.xlsx"], "Page": 0},
+        {"Path": "//Document/Sect/Table/TR/TD/P", "Text": "cell"},
+        {"Path": "//Document/Sect/Table[2]", "filePaths": ["tables/fileoutpart1.xlsx"], "Page": 1},
+        {"Path": "//Document/Sect/Table[2]/TR/TH/P", "Text": "head"},
+        {"Path": "//Document/Sect/P", "Text": "after"},
+    ]
+    write_structured_data(str(tmp_path), {"elements": elements})
+    store = TableStore(str(tmp_path), data_version(str(tmp_path)))
+    assert [store.table_for(i, el["Path"]) for i, el in enumerate(elements)] == [None, 1, 1, 3, 3, None]
+    assert store.table_for(9, "//Document/Sect/TableNote") is None
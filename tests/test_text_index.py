@@ -0,0 +1,44 @@
+import json
+import os
+from conftest import DORA
+from docstore import data_version
+from elements_store import ElementStore
+from text_index import TextIndex, TEXT_INDEX_NAME, tokenize
+
+
+def test_tokenize():
+    assert tokenize("LoRA, a low-rank method (2021)") == ["lora", "low", "rank", "method", "2021"]
+
+
+def test_search_finds_every_element_containing_the_words(paper_dir):
+    outdir = paper_dir(DORA)
+    elements = ElementStore.load(outdir)
+    index = TextIndex.load(outdir, elements, data_version(outdir))
+    hits = index.search("weight decomposition")
+    assert hits and hits == sorted(hits)
+    for i in hits:
+        words = set(tokenize(elements.text(i)))
+        assert "weight" in words and any(w.startswith("decomposition") for w in words)
+    expected = [
+        i for i in range(len(elements))
+        if {"weight", "decomposition"} <= set(tokenize(elements.text(i) or ""))
+    ]
+    assert set(expected) <= set(hits)
+
+
+def test_last_word_matches_as_prefix_and_index_is_persisted(paper_dir):
+    outdir = paper_dir(DORA)
+    elements = ElementStore.load(outdir)
+    index = TextIndex.load(outdir, elements, data_version(outdir))
+    assert set(index.search("decomp")) >= set(index.search("decomposition"))
+    assert index.search("") == []
+    assert TextIndex.load(outdir, elements, data_version(outdir)).search("dora") == index.search("dora")
+
+
+def test_index_from_another_version_is_rebuilt(paper_dir):
+    outdir = paper_dir(DORA)
+    elements = ElementStore.load(outdir)
+    with open(os.path.join(outdir, TEXT_INDEX_NAME), "w") as f:
+        json.dump({"version": -1.0, "postings": {"zzstale": [0]}}, f)
+    assert TextIndex.load(outdir, elements, -1.0).search("zzstale") == [0]
+    assert TextIndex.load(outdir, elements, data_version(outdir)).search("zzstale") == []
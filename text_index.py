@@ -0,0 +1,67 @@
+import os
+import re
+import json
+import bisect
+from collections import defaultdict
+from docstore import write_atomic
+
+TEXT_INDEX_NAME = "text_index.json"
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 or t.isdigit()]
+
+
+class TextIndex:
+    """Inverted index from lowercase tokens to the elements whose `Text` contains them.
+
+    Built once per extraction and kept in `<outdir>/text_index.json`, tagged
+    with the structuredData version it was built from; the last query word
+    also matches as a prefix so results narrow while typing.
+    """
+
+    def __init__(self, postings):
+        self.postings = postings
+        self.vocab = sorted(postings)
+
+    @classmethod
+    def load(cls, outdir, elements, version):
+        path = os.path.join(outdir, TEXT_INDEX_NAME)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("version") == version:
+                return cls(data["postings"])
+        except (OSError, ValueError, KeyError):
+            pass
+        postings = defaultdict(list)
+        for i in range(len(elements)):
+            for token in set(tokenize(elements.text(i) or "")):
+                postings[token].append(i)
+        payload = {"version": version, "postings": postings}
+        write_atomic(path, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        return cls(dict(postings))
+
+    def _prefixed(self, prefix):
+        matches = set()
+        start = bisect.bisect_left(self.vocab, prefix)
+        for token in self.vocab[start:]:
+            if not token.startswith(prefix):
+                break
+            matches.update(self.postings[token])
+        return matches
+
+    def search(self, query):
+        """Returns the indices of elements containing every query word, in document order."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        *words, last = tokens
+        result = self._prefixed(last)
+        for word in sorted(words, key=lambda w: len(self.postings.get(w, ()))):
+            if not result:
+                break
+            result.intersection_update(self.postings.get(word, ()))
+        return sorted(result)